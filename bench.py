@@ -0,0 +1,222 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from cards import CardPool  # noqa: E402
+from deck import random_card  # noqa: E402
+from engine import BingoEngine  # noqa: E402
+from patterns import PATTERNS  # noqa: E402
+
+BENCHMARKS = []
+
+
+def benchmark(name, number=100, setup=None):
+    # Registers fn(state) to be timed `number` calls at a time; setup(), if
+    # given, builds the state and runs before every batch
+    def decorate(func):
+        BENCHMARKS.append((name, func, number, setup))
+        return func
+    return decorate
+
+
+def run(func, number, setup, repeat):
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        started = time.perf_counter()
+        for _ in range(number):
+            func(state)
+        times.append((time.perf_counter() - started) / number)
+    return {'median_us': statistics.median(times) * 1e6, 'min_us': min(times) * 1e6,
+            'number': number, 'repeat': repeat}
+
+
+_app = None
+
+
+def bingo_app():
+    global _app
+    if _app is None:
+        from gui import BingoApp
+        _app = BingoApp(['bench'])
+    return _app
+
+
+def fresh_app():
+    app = bingo_app()
+    app.session.control_window.reset_all()
+    app.processEvents()
+    return app
+
+
+def seeded_app(seed):
+    # fresh_app() and a seeded rng, so every run times the same workload
+    def setup():
+        return fresh_app(), random.Random(seed)
+    return setup
+
+
+# Headless draw engine
+
+@benchmark('engine.full_game', number=200, setup=BingoEngine)
+def engine_full_game(engine):
+    engine.reset()
+    while engine.draw() is not None:
+        pass
+
+
+@benchmark('engine.draw_undo', number=10000, setup=BingoEngine)
+def engine_draw_undo(engine):
+    engine.draw()
+    engine.undo()
+
+
+# Pattern matching
+
+def random_marks():
+    rng = random.Random(1)
+    return [rng.getrandbits(25) | 1 << 12 for _ in range(1000)]
+
+
+for _mode, _pattern in PATTERNS.items():
+    benchmark(f'pattern.matches[{_mode}]', number=10, setup=random_marks)(
+        lambda marks, pattern=_pattern: [pattern.matches(marked) for marked in marks])
+
+
+# Card pool winner checks
+
+def card_pool(count):
+    def setup():
+        rng = random.Random(2)
+        pool = CardPool((random_card(rng) for _ in range(count)), PATTERNS['Single Bingo'])
+        order = rng.sample(range(1, 76), 75)
+        return pool, order
+    return setup
+
+
+def pool_full_game(state):
+    pool, order = state
+    pool.reset_calls()
+    for number in order:
+        pool.call(number)
+
+
+def pool_verify(state):
+    pool, _ = state
+    for card_number in range(1, 1001):
+        pool.verify(card_number)
+
+
+# GUI update paths, offscreen
+
+def ball_selector():
+    app = fresh_app()
+    return app.session.ball_selector_window
+
+
+@benchmark('BallSelectorWindow.show_drawn', number=75, setup=ball_selector)
+def ball_selector_draw(window):
+    window.show_drawn(window.engine.draw())
+
+
+@benchmark('BallSelectorWindow.prepare_next_ball', number=1000, setup=ball_selector)
+def ball_selector_prepare(window):
+    window.prepare_next_ball()
+
+
+@benchmark('BingoApp.full_game', number=1, setup=fresh_app)
+def app_full_game(app):
+    for _ in range(75):
+        app.session.draw_ball()
+    app.processEvents()
+
+
+@benchmark('DisplayWindow.update_display', number=75, setup=seeded_app(3))
+def display_update(state):
+    app, rng = state
+    app.session.display_window.update_display(rng.randint(1, 75))
+    app.processEvents()
+
+
+@benchmark('DisplayWindow.clear_display', number=20, setup=fresh_app)
+def display_clear(app):
+    app.session.display_window.update_display_many(range(1, 76))
+    app.session.display_window.clear_display()
+    app.processEvents()
+
+
+for _mode in PATTERNS:
+    benchmark(f'DisplayWindow.update_game_mode[{_mode}]', number=20, setup=fresh_app)(
+        lambda app, mode=_mode: (app.session.display_window.update_game_mode(mode), app.processEvents()))
+
+
+@benchmark('ControlWindow.select_odd', number=20, setup=fresh_app)
+def control_select_odd(app):
+    app.session.control_window.select_odd()
+    app.processEvents()
+
+
+@benchmark('ControlWindow.select_ending', number=20, setup=seeded_app(4))
+def control_select_ending(state):
+    app, rng = state
+    app.session.control_window.select_ending(rng.randint(0, 9))
+    app.processEvents()
+
+
+def register_card_benchmarks(count):
+    benchmark(f'CardPool.full_game[{count}]', number=1, setup=card_pool(count))(pool_full_game)
+    benchmark(f'CardPool.verify_1000[{count}]', number=10, setup=card_pool(count))(pool_verify)
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before and result['median_us'] > before['median_us'] * (1 + threshold):
+            regressions.append((name, before['median_us'], result['median_us']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the draw, pattern, card and GUI update paths.')
+    parser.add_argument('-k', '--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--cards', type=int, default=100000, help='card pool size for the winner checks')
+    parser.add_argument('--output', metavar='PATH', help='write results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='baseline JSON to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown against the baseline')
+    args = parser.parse_args(argv)
+
+    register_card_benchmarks(args.cards)
+    results = {}
+    for name, func, number, setup in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        results[name] = run(func, number, setup, args.repeat)
+        print(f"{name:<55}{results[name]['median_us']:>14.1f} us")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'created': time.time(), 'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.1f} us -> {after:.1f} us")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+from PyQt5.QtCore import QRectF, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QFont, QPainter
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+import theme
+
+
+class CallBoard(QWidget):
+    # The master call sheet painted as one widget from a bitmask of called
+    # numbers (bit n is ball n). Column 0 holds the BINGO letters and each
+    # letter row holds its 15 numbers. Brushes and pens come from the current
+    # theme, read once per paint.
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.called = 0
+        self._cell = 1.0
+        self._font = QFont()
+        self._font.setBold(True)
+        self.setMinimumSize(16 * 36, 5 * 36)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def sizeHint(self):
+        return QSize(16 * 100, 5 * 100)
+
+    def resizeEvent(self, event):
+        # Square cells as large as fit, with text scaled like 24px on 100px cells
+        self._cell = min(self.width() / 16, self.height() / 5)
+        self._font.setPixelSize(max(8, int(self._cell * 0.24)))
+        super().resizeEvent(event)
+
+    def cell_rect(self, row, col):
+        return QRectF(col * self._cell, row * self._cell, self._cell, self._cell)
+
+    def number_rect(self, number):
+        return self.cell_rect((number - 1) // 15, (number - 1) % 15 + 1)
+
+    def set_called(self, called):
+        # Repaints only the cells whose state changed
+        changed = self.called ^ called
+        self.called = called
+        while changed:
+            low = changed & -changed
+            self.update(self.number_rect(low.bit_length() - 1).toAlignedRect())
+            changed ^= low
+
+    def paintEvent(self, event):
+        colors = theme.current
+        dirty = QRectF(event.rect())
+        painter = QPainter(self)
+        if colors.background_brush is not None:
+            painter.fillRect(event.rect(), colors.background_brush)
+        painter.setFont(self._font)
+        for row in range(5):
+            rect = self.cell_rect(row, 0)
+            if rect.intersects(dirty):
+                painter.fillRect(rect, colors.letter_brushes[row])
+                painter.setPen(colors.header_pens[row])
+                painter.drawText(rect, Qt.AlignCenter, 'BINGO'[row])
+            for col in range(1, 16):
+                rect = self.cell_rect(row, col)
+                if not rect.intersects(dirty):
+                    continue
+                number = row * 15 + col
+                if self.called >> number & 1:
+                    painter.fillRect(rect, colors.letter_brushes[row])
+                    if row == 2:
+                        painter.setPen(colors.n_border_pen)
+                        painter.drawRect(rect.adjusted(1, 1, -1, -1))
+                    painter.setPen(colors.letter_pens[row])
+                else:
+                    painter.setPen(colors.text_pen)
+                painter.drawText(rect, Qt.AlignCenter, str(number))
+
+
+class TemplateCard(QWidget):
+    # The game template: a header row of letters over a 5x5 card whose
+    # highlighted cells come from a pattern mask (bit row * 5 + col)
+    cell_clicked = pyqtSignal(int, int)
+
+    def __init__(self, card, parent=None):
+        super().__init__(parent)
+        self.card = card
+        self.mask = 0
+        self._cell = 60.0
+        self._header_font = QFont()
+        self._header_font.setBold(True)
+        self._font = QFont()
+        self.setMinimumSize(5 * 60, 6 * 60)
+
+    def sizeHint(self):
+        return QSize(5 * 60, 6 * 60)
+
+    def resizeEvent(self, event):
+        self._cell = min(self.width() / 5, self.height() / 6)
+        self._header_font.setPixelSize(max(8, int(self._cell * 0.3)))
+        self._font.setPixelSize(max(8, int(self._cell * 0.22)))
+        super().resizeEvent(event)
+
+    def cell_rect(self, row, col):
+        # Row 0 is the letter header, card rows start at 1
+        return QRectF(col * self._cell, row * self._cell, self._cell, self._cell)
+
+    def set_card(self, card):
+        self.card = card
+        self.update()
+
+    def set_mask(self, mask):
+        changed = self.mask ^ mask
+        self.mask = mask
+        for index in range(25):
+            if changed >> index & 1:
+                self.update(self.cell_rect(index // 5 + 1, index % 5).toAlignedRect())
+
+    def mousePressEvent(self, event):
+        row = int(event.y() // self._cell) - 1
+        col = int(event.x() // self._cell)
+        if 0 <= row < 5 and 0 <= col < 5:
+            self.cell_clicked.emit(row, col)
+
+    def paintEvent(self, event):
+        colors = theme.current
+        dirty = QRectF(event.rect())
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        if colors.background_brush is not None:
+            painter.fillRect(event.rect(), colors.background_brush)
+        painter.setFont(self._header_font)
+        for col in range(5):
+            rect = self.cell_rect(0, col)
+            if rect.intersects(dirty):
+                painter.fillRect(rect, colors.letter_brushes[col])
+                painter.setPen(colors.header_pens[col])
+                painter.drawText(rect, Qt.AlignCenter, 'BINGO'[col])
+        painter.setFont(self._font)
+        for index in range(25):
+            rect = self.cell_rect(index // 5 + 1, index % 5)
+            if not rect.intersects(dirty):
+                continue
+            inner = rect.adjusted(1, 1, -1, -1)
+            painter.setPen(colors.border_pen)
+            if self.mask >> index & 1:
+                painter.setBrush(colors.highlight_brush)
+                painter.drawRoundedRect(inner, inner.width() / 2, inner.height() / 2)
+                painter.setPen(colors.highlight_pen)
+            else:
+                painter.setBrush(Qt.NoBrush)
+                painter.drawRect(inner)
+                painter.setPen(colors.text_pen)
+            text = 'Free Space' if index == 12 else str(self.card[index])
+            painter.drawText(inner, Qt.AlignCenter | Qt.TextWordWrap, text)
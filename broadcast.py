@@ -0,0 +1,179 @@
+import asyncio
+import json
+import threading
+
+# Newline-delimited JSON over TCP. A subscriber first receives a snapshot of
+# the board and then one small delta per event:
+#   {"type": "snapshot", "called": [...], "recent": [...], "mode": ..., "up_next": ...}
+#   {"type": "draw", "ball": 17, "up_next": 52}
+#   {"type": "select", "called": [...], "uncalled": [...], "up_next": ...}  numbers marked by hand
+#   {"type": "mode", "mode": "Blackout"}
+#   {"type": "reset"}
+
+
+class BoardSnapshot:
+    # Enough of the game to bring a late subscriber up to date, kept in step
+    # with the deltas that are published
+
+    def __init__(self, recent_size=5):
+        self.called = set()
+        self.recent = []
+        self.recent_size = recent_size
+        self.mode = None
+        self.up_next = None
+
+    def apply(self, message):
+        kind = message['type']
+        if kind == 'draw':
+            self.called.add(message['ball'])
+            self.recent = [message['ball']] + self.recent[:self.recent_size - 1]
+            self.up_next = message.get('up_next')
+        elif kind == 'select':
+            self.called |= set(message['called'])
+            self.called -= set(message['uncalled'])
+            self.up_next = message.get('up_next')
+        elif kind == 'mode':
+            self.mode = message['mode']
+        elif kind == 'reset':
+            self.called.clear()
+            self.recent = []
+            self.up_next = None
+
+    def message(self):
+        return {'type': 'snapshot', 'called': sorted(self.called), 'recent': self.recent,
+                'mode': self.mode, 'up_next': self.up_next}
+
+
+def encode(message):
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class BroadcastServer:
+    # Runs an asyncio server on its own thread. publish() only hands the
+    # message to the loop, so the caller never waits on the network. Each
+    # subscriber has a bounded queue; one that falls behind has its queue
+    # replaced by a fresh snapshot instead of holding back anyone else.
+
+    def __init__(self, host='0.0.0.0', port=8765, queue_size=256):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.snapshot = BoardSnapshot()
+        self._clients = set()
+        self._tasks = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='bingo-broadcast', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._server is None:
+            raise OSError(f"could not listen on {self.host}:{self.port}")
+        return self
+
+    def stop(self):
+        if self._server is not None and self._thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+    def publish(self, message):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._publish, message)
+
+    def draw(self, ball, up_next):
+        self.publish({'type': 'draw', 'ball': ball, 'up_next': up_next})
+
+    def select(self, called, uncalled, up_next):
+        # A manual mark can take the up next ball, so every select carries it
+        self.publish({'type': 'select', 'called': sorted(called), 'uncalled': sorted(uncalled), 'up_next': up_next})
+
+    def mode(self, mode):
+        self.publish({'type': 'mode', 'mode': mode})
+
+    def reset(self):
+        self.publish({'type': 'reset'})
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._serve_client, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError:
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _shutdown(self):
+        self._server.close()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def _publish(self, message):
+        self.snapshot.apply(message)
+        data = encode(message)
+        for queue, _ in self._clients:
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                self._resync(queue)
+
+    def _resync(self, queue):
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(encode(self.snapshot.message()))
+
+    async def _serve_client(self, reader, writer):
+        queue = asyncio.Queue(self.queue_size)
+        queue.put_nowait(encode(self.snapshot.message()))
+        client = (queue, writer)
+        self._clients.add(client)
+        self._tasks.add(asyncio.current_task())
+        reader_task = asyncio.ensure_future(reader.read())  # completes when the client hangs up
+        get_task = None
+        try:
+            while not reader_task.done():
+                get_task = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({get_task, reader_task}, return_when=asyncio.FIRST_COMPLETED)
+                if get_task not in done:
+                    break
+                writer.write(get_task.result())
+                await writer.drain()
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass  # Client went away or the server is shutting down
+        finally:
+            self._clients.discard(client)
+            self._tasks.discard(asyncio.current_task())
+            reader_task.cancel()
+            if get_task is not None:
+                get_task.cancel()
+            writer.close()
+
+
+async def subscribe(host, port):
+    # Yields messages from a BroadcastServer, starting with the snapshot
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            yield json.loads(line)
+    finally:
+        writer.close()
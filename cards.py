@@ -0,0 +1,130 @@
+from array import array
+
+from deck import Deck
+from patterns import FREE_SPACE
+
+
+def load_cards(path):
+    # Yields cards from a deck file, or from a text file with one card per
+    # line: 25 numbers in row order (the free space may be written as 0) or
+    # 24 numbers with the free space left out
+    if path.endswith('.deck'):
+        with Deck(path) as deck:
+            yield from deck
+        return
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            numbers = [int(n) for n in line.replace(',', ' ').split()]
+            if not numbers:
+                continue
+            if len(numbers) == 24:
+                numbers.insert(12, 0)
+            if len(numbers) != 25:
+                raise ValueError(f"{path}:{line_no}: expected 24 or 25 numbers, got {len(numbers)}")
+            yield tuple(numbers)
+
+
+def check_card(card, card_number):
+    for i, number in enumerate(card):
+        if i != 12 and not 1 + (i % 5) * 15 <= number <= 15 + (i % 5) * 15:
+            raise ValueError(f"card {card_number}: {number} is not valid in column {'BINGO'[i % 5]}")
+
+
+class CardPool:
+    # Registered cards with an inverted index from each number to the cells
+    # that hold it, so a call only touches the cards containing that number.
+    # Cards are numbered from 1 in everything this class returns.
+
+    def __init__(self, cards=(), pattern=None):
+        self.pattern = pattern
+        self.called = 0
+        self.hits = array('I')
+        self.winners = {}  # card number -> calls made when it won
+        self._index = [array('I') for _ in range(76)]
+        self._calls = 0
+        for card in cards:
+            self.add(card)
+
+    def __len__(self):
+        return len(self.hits)
+
+    def add(self, card):
+        card_id = len(self.hits)
+        check_card(card, card_id + 1)
+        marked = FREE_SPACE
+        for i, number in enumerate(card):
+            if i == 12:
+                continue
+            self._index[number].append(card_id << 5 | i)
+            if self.called >> number & 1:
+                marked |= 1 << i
+        self.hits.append(marked)
+        if self.pattern is not None and self.pattern.matches(marked):
+            self.winners[card_id + 1] = self._calls
+        return card_id + 1
+
+    def call(self, number):
+        # Returns the cards that became winners with this call
+        if self.called >> number & 1:
+            return []
+        self.called |= 1 << number
+        self._calls += 1
+        hits = self.hits
+        pattern = self.pattern
+        winners = self.winners
+        new_winners = []
+        for entry in self._index[number]:
+            card_id = entry >> 5
+            index = entry & 31
+            marked = hits[card_id] | 1 << index
+            hits[card_id] = marked
+            if pattern is not None and pattern.completed_by(marked, index) and card_id + 1 not in winners:
+                winners[card_id + 1] = self._calls
+                new_winners.append(card_id + 1)
+        return new_winners
+
+    def uncall(self, number):
+        if not self.called >> number & 1:
+            return
+        self.called &= ~(1 << number)
+        self._calls -= 1
+        hits = self.hits
+        pattern = self.pattern
+        winners = self.winners
+        for entry in self._index[number]:
+            card_id = entry >> 5
+            marked = hits[card_id] & ~(1 << (entry & 31))
+            hits[card_id] = marked
+            if card_id + 1 in winners and not pattern.matches(marked):
+                del winners[card_id + 1]
+
+    def call_many(self, numbers):
+        new_winners = []
+        for number in numbers:
+            new_winners += self.call(number)
+        return new_winners
+
+    def uncall_many(self, numbers):
+        for number in numbers:
+            self.uncall(number)
+
+    def set_pattern(self, pattern):
+        self.pattern = pattern
+        self.winners = {}
+        if pattern is None:
+            return
+        for card_id, marked in enumerate(self.hits):
+            if pattern.matches(marked):
+                self.winners[card_id + 1] = self._calls
+
+    def reset_calls(self):
+        self.called = 0
+        self._calls = 0
+        self.winners = {}
+        self.hits = array('I', [FREE_SPACE]) * len(self.hits)
+
+    def verify(self, card_number):
+        # Checks a claim against the current calls without scanning the pool
+        if not 1 <= card_number <= len(self.hits):
+            raise IndexError(f"no card {card_number} in the pool")
+        return self.pattern is not None and self.pattern.matches(self.hits[card_number - 1])
@@ -0,0 +1,2 @@
+# Puts the modules at the top of the repository on the path, so that a plain
+# `pytest` finds them as `python -m pytest` does
@@ -0,0 +1,187 @@
+import argparse
+import hashlib
+import mmap
+import os
+import random
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Deck files hold a fixed header followed by one 24 byte record per card: the
+# numbers of the card in row order with the free space left out. Card numbers
+# start at 1, so card n lives at HEADER.size + (n - 1) * RECORD_SIZE.
+MAGIC = b'BDCK'
+VERSION = 1
+RECORD_SIZE = 24
+HEADER = struct.Struct('<4sHHQQ')  # magic, version, record size, seed, count
+
+# Ordered choices of 5 numbers from 15 for B, I, G and O, and of 4 for N
+COLUMN_ARRANGEMENTS = [360360, 360360, 32760, 360360, 360360]
+CARD_SPACE = 1
+for _arrangements in COLUMN_ARRANGEMENTS:
+    CARD_SPACE *= _arrangements
+
+
+def pack_card(card):
+    return bytes(number for i, number in enumerate(card) if i != 12)
+
+
+def unpack_card(record):
+    return tuple(record[:12]) + (0,) + tuple(record[12:])
+
+
+def random_card(rng=random):
+    columns = [rng.sample(range(1 + col * 15, 16 + col * 15), 5) for col in range(5)]
+    return tuple(0 if (row, col) == (2, 2) else columns[col][row] for row in range(5) for col in range(5))
+
+
+def card_from_index(index):
+    # Mixed radix decoding of an index in [0, CARD_SPACE) into one ordered
+    # arrangement per column, so distinct indexes give distinct cards
+    columns = []
+    for col, arrangements in enumerate(COLUMN_ARRANGEMENTS):
+        index, rank = divmod(index, arrangements)
+        remaining = list(range(1 + col * 15, 16 + col * 15))
+        column = []
+        for size in range(15, 10 if col != 2 else 11, -1):
+            rank, pick = divmod(rank, size)
+            column.append(remaining.pop(pick))
+        if col == 2:
+            column.insert(2, 0)
+        columns.append(column)
+    return tuple(columns[col][row] for row in range(5) for col in range(5))
+
+
+class CardGenerator:
+    # Keyed Feistel permutation of the card space with cycle walking. Card n of
+    # a seed is always the same card and no two card numbers share a card, so
+    # decks of any size are unique without remembering what was generated.
+
+    ROUNDS = 4
+
+    def __init__(self, seed):
+        self.seed = seed
+        self._key = seed.to_bytes(8, 'little')
+        self._half_bits = (CARD_SPACE.bit_length() + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        self._digest_size = (self._half_bits + 7) // 8
+
+    def _round(self, round_no, value):
+        digest = hashlib.blake2b(value.to_bytes(self._digest_size, 'little'), digest_size=self._digest_size,
+                                 key=self._key, person=bytes([round_no]) * 16).digest()
+        return int.from_bytes(digest, 'little') & self._half_mask
+
+    def _permute(self, value):
+        left, right = value >> self._half_bits, value & self._half_mask
+        for round_no in range(self.ROUNDS):
+            left, right = right, left ^ self._round(round_no, right)
+        return left << self._half_bits | right
+
+    def index(self, card_number):
+        if not 1 <= card_number <= CARD_SPACE:
+            raise IndexError(f"card {card_number} is out of range")
+        value = self._permute(card_number - 1)
+        while value >= CARD_SPACE:
+            value = self._permute(value)
+        return value
+
+    def card(self, card_number):
+        return card_from_index(self.index(card_number))
+
+
+def _pack_range(seed, start, end):
+    generator = CardGenerator(seed)
+    return b''.join(pack_card(generator.card(n)) for n in range(start, end))
+
+
+def write_deck(path, count, seed, chunk=4096, workers=1):
+    # Streams cards to a temporary file and renames it into place when done.
+    # Every card depends only on the seed and its number, so chunks can be
+    # generated in separate processes and written back in order.
+    starts = range(1, count + 1, chunk)
+    ends = [min(start + chunk, count + 1) for start in starts]
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, seed, count))
+        if workers > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                for data in pool.map(_pack_range, [seed] * len(starts), starts, ends):
+                    f.write(data)
+        else:
+            for start, end in zip(starts, ends):
+                f.write(_pack_range(seed, start, end))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Deck:
+    # Read-only, memory-mapped view of a deck file
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path}: not a deck file")
+        magic, version, record_size, self.seed, self.count = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"{path}: not a version {VERSION} deck file")
+        if len(self._mmap) < HEADER.size + self.count * RECORD_SIZE:
+            self.close()
+            raise ValueError(f"{path}: deck is truncated")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        data = self._mmap
+        for offset in range(HEADER.size, HEADER.size + self.count * RECORD_SIZE, RECORD_SIZE):
+            yield unpack_card(data[offset:offset + RECORD_SIZE])
+
+    def close(self):
+        self._mmap.close()
+
+    def record(self, card_number):
+        if not 1 <= card_number <= self.count:
+            raise IndexError(f"no card {card_number} in {self.path}")
+        offset = HEADER.size + (card_number - 1) * RECORD_SIZE
+        return self._mmap[offset:offset + RECORD_SIZE]
+
+    def card(self, card_number):
+        return unpack_card(self.record(card_number))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate or inspect a deck of unique bingo cards.')
+    parser.add_argument('path')
+    parser.add_argument('--count', type=int, help='generate this many cards')
+    parser.add_argument('--seed', type=int, help='seed for a new deck (random if omitted)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='processes used to generate cards')
+    parser.add_argument('--show', type=int, metavar='CARD', help='print one card from the deck')
+    args = parser.parse_args(argv)
+
+    if args.count is not None:
+        seed = args.seed if args.seed is not None else random.getrandbits(64)
+        write_deck(args.path, args.count, seed, workers=args.workers)
+        print(f"Wrote {args.count} cards to {args.path} (seed {seed})")
+    if args.show is not None:
+        with Deck(args.path) as deck:
+            card = deck.card(args.show)
+        print(f"Card #{args.show}")
+        for row in range(5):
+            print(' '.join(f"{'FR' if n == 0 else n:>2}" for n in card[row * 5:row * 5 + 5]))
+    if args.count is None and args.show is None:
+        parser.error('nothing to do, pass --count or --show')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
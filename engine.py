@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import random
+import secrets
+import sys
+
+LETTERS = 'BINGO'
+
+
+def letter_of(number):
+    return LETTERS[(number - 1) // 15]
+
+
+def new_session_seed():
+    return secrets.randbits(64)
+
+
+def game_seed(session_seed, game_number):
+    # Each game of a session gets its own seed, so any game can be generated
+    # on its own from the session seed and its number
+    data = session_seed.to_bytes(8, 'little') + game_number.to_bytes(4, 'little')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def draw_sequence(seed):
+    # The full 75-ball draw order of a game as bytes. Each call picks a
+    # letter that still has balls, then a ball within that letter.
+    rng = random.Random(seed)
+    pools = [list(range(1 + i * 15, 16 + i * 15)) for i in range(5)]
+    sequence = bytearray()
+    while pools:
+        pool = rng.choice(pools)
+        sequence.append(pool.pop(rng.randrange(len(pool))))
+        if not pool:
+            pools.remove(pool)
+    return bytes(sequence)
+
+
+def day_sequences(session_seed, games):
+    # Draw orders for games 1..games of a session, e.g. to print ahead of time
+    return [draw_sequence(game_seed(session_seed, number)) for number in range(1, games + 1)]
+
+
+def call_at(session_seed, game_number, call):
+    # Ball number `call` (1-based) of a game's draw order
+    return draw_sequence(game_seed(session_seed, game_number))[call - 1]
+
+
+class BingoEngine:
+    # Draw state without any Qt dependency. Every game plays out a 75-ball
+    # sequence derived from the session seed and the game number. Called
+    # numbers live in a 75-bit integer (bit n is ball n); a cursor into the
+    # sequence skips balls that were marked by hand, so draw, undo, peek and
+    # mark are O(1) amortised.
+
+    def __init__(self, session_seed=None):
+        self.session_seed = new_session_seed() if session_seed is None else session_seed
+        self.game_number = 0
+        self.called = 0
+        self.reset()
+
+    def reset(self):
+        # Starts the next game of the session. A game with nothing called
+        # yet is kept, so pressing Reset on a clean board does not skip a
+        # game and the night still follows day_sequences().
+        if self.called or not self.game_number:
+            self.game_number += 1
+        self.called = 0
+        self.history = []
+        self.reseed(game_seed(self.session_seed, self.game_number))
+
+    def start_session(self, session_seed, game_number=1):
+        # Switches to a game of another session; balls already called stay
+        # called and are skipped in the new sequence
+        self.session_seed = session_seed
+        self.game_number = game_number
+        self.reseed(game_seed(session_seed, game_number))
+
+    def reseed(self, seed):
+        self.seed = seed
+        self.sequence = draw_sequence(seed)
+        self._positions = bytearray(76)
+        for pos, ball in enumerate(self.sequence):
+            self._positions[ball] = pos
+        self._cursor = 0
+
+    def is_called(self, number):
+        return bool(self.called >> number & 1)
+
+    def remaining(self):
+        return 75 - bin(self.called).count('1')
+
+    def ball_at(self, call):
+        # Ball number `call` (1-based) of this game's sequence
+        return self.sequence[call - 1]
+
+    def peek(self):
+        sequence, cursor = self.sequence, self._cursor
+        while cursor < 75 and self.called >> sequence[cursor] & 1:
+            cursor += 1
+        self._cursor = cursor
+        return sequence[cursor] if cursor < 75 else None
+
+    def draw(self):
+        ball = self.peek()
+        if ball is None:
+            return None  # No balls left to draw
+        self.called |= 1 << ball
+        self._cursor += 1
+        self.history.append(('draw', ball))
+        return ball
+
+    def mark(self, number):
+        if self.is_called(number):
+            return False
+        self.called |= 1 << number
+        self.history.append(('mark', number))
+        return True
+
+    def mark_many(self, numbers):
+        marked = [number for number in numbers if not self.is_called(number)]
+        for number in marked:
+            self.called |= 1 << number
+            self.history.append(('mark', number))
+        return marked
+
+    def undo(self):
+        if not self.history:
+            return None
+        _, number = self.history.pop()
+        # The ball goes back to its place in the sequence
+        self.called &= ~(1 << number)
+        self._cursor = min(self._cursor, self._positions[number])
+        return number
+
+    def replay_draw(self, ball):
+        # Re-applies a draw recorded elsewhere, such as in a game journal. A
+        # ball that is not next in the sequence (a journal written before
+        # games were seeded) is taken out of turn.
+        if self.is_called(ball):
+            raise ValueError(f"ball {ball} has already been called")
+        if ball == self.peek():
+            self._cursor += 1
+        self.called |= 1 << ball
+        self.history.append(('draw', ball))
+
+    def recent(self, count):
+        # Most recently drawn balls, newest first
+        drawn = []
+        for kind, number in reversed(self.history):
+            if kind == 'draw':
+                drawn.append(number)
+                if len(drawn) == count:
+                    break
+        return drawn
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the draw order of a session's games.")
+    parser.add_argument('session_seed', type=int)
+    parser.add_argument('--games', type=int, default=1, help='print games 1..GAMES')
+    parser.add_argument('--game', type=int, help='only this game')
+    parser.add_argument('--call', type=int, help='only this call of --game')
+    args = parser.parse_args(argv)
+
+    if args.call is not None:
+        ball = call_at(args.session_seed, args.game or 1, args.call)
+        print(f"{letter_of(ball)} {ball}")
+        return 0
+    if args.game:
+        games = [(args.game, draw_sequence(game_seed(args.session_seed, args.game)))]
+    else:
+        games = enumerate(day_sequences(args.session_seed, args.games), 1)
+    for number, sequence in games:
+        print(f"game {number}: " + ' '.join(f"{letter_of(ball)}{ball}" for ball in sequence))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
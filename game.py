@@ -0,0 +1,166 @@
+from cards import CardPool, load_cards
+from host import SharedCardPool
+from journal import N_COLUMN, Journal, JournalState, replay
+from patterns import find_pattern
+
+ALL_NUMBERS = frozenset(range(1, 76))
+
+
+class Game:
+    # The rules of one game, without any windows, shared by gui.GameSession
+    # and --no-gui: draws and manual selections toggle numbers on the call
+    # sheet, modes that mark the N column toggle it, and everything is
+    # journalled, broadcast and recorded in the same order either way.
+    #
+    # Toggles are applied at once unless `call_sheet` is set. Then it is
+    # called with the numbers instead, and whatever shows the call sheet
+    # hands them back, possibly batched, to toggled().
+
+    def __init__(self, journal_path=None, session_seed=None, card_workers=None):
+        # Raises ValueError when the journal cannot be replayed
+        self.journal_path = journal_path
+        self.state = replay(journal_path) if journal_path else JournalState()
+        self.engine = self.state.engine
+        if session_seed is not None and not self.state.seeded:
+            self.engine.start_session(session_seed)
+        self.card_workers = card_workers
+        self.card_pool = self.new_card_pool(find_pattern(self.state.mode))
+        self.card_pool.call_many(self.state.called)
+        self.journal = None
+        self.broadcast = None
+        self.stats = None
+        self.call_sheet = None
+        self._drawn = set()  # balls whose draw delta already put them on the remote boards
+
+    def start(self, broadcast=None, stats=None):
+        # Starts journalling, broadcasting and recording the game. Cards
+        # restored from the journal are loaded before this, so they are not
+        # journalled again.
+        if self.journal_path:
+            self.journal = Journal(self.journal_path, state=self.state)
+            if not self.state.seeded:
+                self.journal.game(self.engine.session_seed, self.engine.game_number)
+        self.broadcast = broadcast
+        if broadcast is not None:
+            snapshot = broadcast.snapshot
+            snapshot.called = set(self.state.called)
+            snapshot.recent = self.engine.recent(snapshot.recent_size)
+            snapshot.mode = self.state.mode
+            snapshot.up_next = self.up_next()
+        self.stats = stats
+        if stats is not None:
+            stats.start_game(self.engine.session_seed, self.engine.game_number, self.state.mode, resume=True)
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+
+    def new_card_pool(self, pattern=None):
+        if self.card_workers is not None:
+            return SharedCardPool(self.card_workers, pattern=pattern)
+        return CardPool(pattern=pattern)
+
+    def calls_made(self):
+        return 75 - self.engine.remaining()
+
+    def up_next(self):
+        # The ball Up Next shows, which it only does once a ball is drawn
+        return self.engine.peek() if self.engine.recent(1) else None
+
+    def draw(self):
+        ball = self.engine.draw()
+        if ball is None:
+            return None
+        if self.journal is not None:
+            self.journal.draw(ball, self.engine.peek())
+        if self.broadcast is not None:
+            self.broadcast.draw(ball, self.engine.peek())
+            self._drawn.add(ball)
+        if self.stats is not None:
+            self.stats.call(ball, self.calls_made())
+        self._toggle(frozenset((ball,)))
+        return ball
+
+    def select(self, numbers):
+        numbers = ALL_NUMBERS.intersection(numbers)
+        self.engine.mark_many(numbers)
+        if self.journal is not None:
+            self.journal.select(numbers, self.engine.peek())
+        if self.stats is not None:
+            self.stats.select(numbers, self.calls_made())
+        self._toggle(numbers)
+
+    def set_mode(self, mode):
+        self.state.mode = mode
+        pattern = find_pattern(mode)
+        self.state.template_mask = pattern.display if pattern else 0
+        self.card_pool.set_pattern(pattern)
+        if self.journal is not None:
+            self.journal.mode(mode)
+        if self.broadcast is not None:
+            self.broadcast.mode(mode)
+        if self.stats is not None:
+            self.stats.set_mode(mode)
+        if pattern is not None and pattern.marks_n_column:
+            self._toggle(N_COLUMN)
+
+    def template(self, mask):
+        self.state.template_mask = mask
+        if self.journal is not None:
+            self.journal.template(mask)
+
+    def load_cards(self, path):
+        # Raises OSError or ValueError and keeps the current cards when the
+        # file cannot be loaded
+        card_pool = self.new_card_pool(self.card_pool.pattern)
+        card_pool.call_many(self.state.called)
+        for card in load_cards(path):
+            card_pool.add(card)
+        self.card_pool = card_pool
+        self.state.cards_path = path
+        if self.journal is not None:
+            self.journal.cards(path)
+
+    def verify(self, card_number):
+        winner = self.card_pool.verify(card_number)
+        if self.stats is not None:
+            self.stats.claim(card_number, self.calls_made(), winner)
+        return winner
+
+    def reset(self):
+        if self.stats is not None:
+            self.stats.end_game(self.calls_made())
+        self.engine.reset()
+        self.state.called.clear()
+        self.state.template_mask = 0
+        self.card_pool.reset_calls()
+        self._drawn.clear()
+        if self.journal is not None:
+            self.journal.reset()
+            self.journal.game(self.engine.session_seed, self.engine.game_number)
+        if self.broadcast is not None:
+            self.broadcast.reset()
+        if self.stats is not None:
+            self.stats.start_game(self.engine.session_seed, self.engine.game_number, self.state.mode)
+
+    def _toggle(self, numbers):
+        if self.call_sheet is not None:
+            self.call_sheet(numbers)
+        else:
+            self.toggled(numbers - self.state.called, numbers & self.state.called)
+
+    def toggled(self, called, uncalled):
+        # Numbers newly called and uncalled on the call sheet. Drawn balls
+        # are left out of the select delta, so remote boards see each draw
+        # once and can tell it from a manual mark.
+        called = called - self.state.called
+        uncalled = uncalled & self.state.called
+        drawn, self._drawn = self._drawn, set()
+        if not called and not uncalled:
+            return
+        self.state.called |= called
+        self.state.called -= uncalled
+        self.card_pool.call_many(called)
+        self.card_pool.uncall_many(uncalled)
+        if self.broadcast is not None and (called - drawn or uncalled):
+            self.broadcast.select(called - drawn, uncalled, self.up_next())
@@ -0,0 +1,691 @@
+import sys
+from itertools import islice
+from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QGridLayout, QLabel, QHBoxLayout, QGroupBox, QSizePolicy, QInputDialog, QFileDialog, QMessageBox
+from PyQt5.QtCore import pyqtSignal, Qt, QTimer, QObject, QEvent
+
+from board import CallBoard, TemplateCard
+from deck import random_card
+from engine import BingoEngine, letter_of
+from game import Game
+from host import CardWorkers, WorkerError, session_path
+from patterns import cell, find_pattern
+import theme
+from tracing import tracer, traced
+
+ALL_NUMBERS = frozenset(range(1, 76))
+
+
+class PaintProbe(QObject):
+    # Delivers paint events to the watched widget itself so that the tracer
+    # sees the moment each paint has finished
+    def __init__(self, name, widget):
+        super().__init__(widget)
+        self.name = name
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() != QEvent.Paint or not tracer.enabled:
+            return False
+        obj.event(event)
+        tracer.painted(self.name)
+        return True
+
+
+class FirstPaint(QObject):
+    # Calls `callback` once, when the widget has finished its first paint
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() != QEvent.Paint:
+            return False
+        obj.removeEventFilter(self)
+        obj.event(event)
+        self.callback()
+        return True
+
+class ControlWindow(QWidget):
+    number_selected = pyqtSignal(int)
+    numbers_selected = pyqtSignal(frozenset)
+    game_mode_selected = pyqtSignal(str)
+    clear_selection = pyqtSignal()
+    manual_mode_entered = pyqtSignal(str)
+    draw_ball = pyqtSignal()
+    reset_ball_selector = pyqtSignal()
+    ball_selected = pyqtSignal(int)
+    cards_file_chosen = pyqtSignal(str)
+    card_claimed = pyqtSignal(int)
+    theme_selected = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.init_ui()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+
+        # BINGO reference
+        bingo_layout = QHBoxLayout()
+        bingo_labels = ['B', 'I', 'N', 'G', 'O']
+        for label in bingo_labels:
+            lbl = QLabel(label)
+            lbl.setAlignment(Qt.AlignCenter)
+            lbl.setStyleSheet("font-size: 24px; font-weight: bold;")
+            bingo_layout.addWidget(lbl)
+        main_layout.addLayout(bingo_layout)
+
+        # Number buttons under each BINGO letter
+        numbers_layout = QHBoxLayout()
+        for i in range(5):
+            column_layout = QVBoxLayout()
+            start = i * 15 + 1
+            for j in range(start, start + 15):
+                btn = QPushButton(str(j))
+                btn.setFixedSize(50, 50)
+                btn.clicked.connect(lambda _, num=j: self.handle_number_selected(num))
+                column_layout.addWidget(btn)
+            numbers_layout.addLayout(column_layout)
+
+        main_layout.addLayout(numbers_layout)
+
+        # Call Ball, Odds, and Evens buttons
+        button_layout = QGridLayout()
+        button_size = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+
+        draw_button = QPushButton('Call Ball')
+        draw_button.setSizePolicy(button_size)
+        draw_button.setFixedHeight(80)  # Double the current height
+        draw_button.clicked.connect(self.call_ball)
+        button_layout.addWidget(draw_button, 0, 0)
+
+        odd_button = QPushButton('Odds')
+        odd_button.setSizePolicy(button_size)
+        odd_button.setFixedHeight(80)  # Double the current height
+        odd_button.clicked.connect(self.select_odd)
+        button_layout.addWidget(odd_button, 0, 1)
+
+        even_button = QPushButton('Evens')
+        even_button.setSizePolicy(button_size)
+        even_button.setFixedHeight(80)  # Double the current height
+        even_button.clicked.connect(self.select_even)
+        button_layout.addWidget(even_button, 0, 2)
+
+        main_layout.addLayout(button_layout)
+
+        # Wild Number Ending Selector
+        wild_layout = QHBoxLayout()
+        wild_label = QLabel("Wild:")
+        wild_layout.addWidget(wild_label)
+        for i in range(10):
+            btn = QPushButton(str(i))
+            btn.setFixedSize(40, 40)
+            btn.clicked.connect(lambda _, end=i: self.select_ending(end))
+            wild_layout.addWidget(btn)
+        main_layout.addLayout(wild_layout)
+
+        # Game mode selection
+        game_mode_group = QGroupBox("Choose or Enter Game Mode")
+        game_mode_layout = QGridLayout()
+        game_modes = [
+            'Single Bingo', 'Double Bingo', 'Triple Bingo', 
+            'Letter X', 'Corner Picture Frame', 'Check Mark', 
+            'Four Corners', 'Heart', 'Postage Stamp', 'Block of 8', 'Blackout'
+        ]
+        for i, mode in enumerate(game_modes):
+            btn = QPushButton(mode)
+            btn.clicked.connect(lambda _, m=mode: self.game_mode_selected.emit(m))
+            game_mode_layout.addWidget(btn, i // 2, i % 2)
+
+        # Manual game mode entry
+        manual_entry_button = QPushButton('Manual Entry')
+        manual_entry_button.clicked.connect(self.manual_entry)
+        game_mode_layout.addWidget(manual_entry_button, len(game_modes) // 2, len(game_modes) % 2)
+
+        game_mode_group.setLayout(game_mode_layout)
+        main_layout.addWidget(game_mode_group)
+
+        # Registered cards
+        cards_layout = QHBoxLayout()
+        load_cards_button = QPushButton('Load Cards')
+        load_cards_button.clicked.connect(self.choose_cards_file)
+        cards_layout.addWidget(load_cards_button)
+        verify_button = QPushButton('Verify Card')
+        verify_button.clicked.connect(self.verify_card)
+        cards_layout.addWidget(verify_button)
+        main_layout.addLayout(cards_layout)
+
+        # High contrast colours for projectors, applied to every window
+        self.theme_button = QPushButton('High Contrast')
+        self.theme_button.setCheckable(True)
+        self.theme_button.setChecked(theme.current.name == 'high-contrast')
+        self.theme_button.clicked.connect(
+            lambda checked: self.theme_selected.emit('high-contrast' if checked else 'default'))
+        main_layout.addWidget(self.theme_button)
+
+        clear_button = QPushButton('Reset')
+        clear_button.clicked.connect(self.reset_all)
+        main_layout.addWidget(clear_button)
+
+        self.setLayout(main_layout)
+        self.setWindowTitle('Stevens Bingo Game Master Controller')
+        self.setMinimumSize(300, 800)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def call_ball(self):
+        tracer.begin('draw_ball')
+        self.draw_ball.emit()
+
+    def handle_number_selected(self, num):
+        tracer.begin('number_selected')
+        self.number_selected.emit(num)
+        self.ball_selected.emit(num)
+
+    def handle_numbers_selected(self, numbers):
+        tracer.begin('numbers_selected')
+        self.numbers_selected.emit(frozenset(numbers))
+
+    def select_odd(self):
+        self.handle_numbers_selected(range(1, 76, 2))
+
+    def select_even(self):
+        self.handle_numbers_selected(range(2, 76, 2))
+
+    def select_ending(self, end):
+        self.handle_numbers_selected(range(end or 10, 76, 10))
+
+    def manual_entry(self):
+        mode, ok = QInputDialog.getText(self, 'Manual Game Mode Entry',
+                                        'Enter a game mode or pattern, e.g.\n'
+                                        '  B1 B5 O1 O5 + row 3\n'
+                                        '  any 2 lines | Four Corners\n'
+                                        '  XX.../XX.../...../...../..... any rotation')
+        if ok and mode:
+            if find_pattern(mode) is None:
+                QMessageBox.information(self, 'Manual Game Mode Entry',
+                                        f"'{mode}' is not a pattern, so claims for it cannot be checked.")
+            self.manual_mode_entered.emit(mode)
+
+    def choose_cards_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Load Cards', '', 'Card files (*.deck *.txt *.csv);;All files (*)')
+        if path:
+            self.cards_file_chosen.emit(path)
+
+    def verify_card(self):
+        card_number, ok = QInputDialog.getInt(self, 'Verify Card', 'Card number:', 1, 1)
+        if ok:
+            self.card_claimed.emit(card_number)
+
+    def reset_all(self):
+        self.clear_selection.emit()
+        self.reset_ball_selector.emit()
+
+class UpNextWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.init_ui()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+
+        self.up_next_label = QLabel("UP NEXT")
+        self.up_next_label.setAlignment(Qt.AlignCenter)
+        self.up_next_label.setStyleSheet("font-size: 24px; font-weight: bold;")
+        main_layout.addWidget(self.up_next_label)
+
+        self.up_next_ball = QLabel()
+        self.up_next_ball.setAlignment(Qt.AlignCenter)
+        self.up_next_ball.setFixedSize(200, 200)
+        self.up_next_ball.setProperty('ball', 'current')
+        main_layout.addWidget(self.up_next_ball, alignment=Qt.AlignCenter)
+
+        self.setLayout(main_layout)
+        self.setWindowTitle('Up Next')
+        self.setMinimumSize(250, 300)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    @traced('UpNextWindow.update_up_next')
+    def update_up_next(self, number):
+        # None shows the empty grey ball
+        letter = '' if number is None else letter_of(number)
+        self.up_next_ball.setText(f"{letter} {number}" if letter else "")
+        if self.up_next_ball.property('letter') != letter:
+            theme.restyle(self.up_next_ball, letter=letter)
+
+class BallSelectorWindow(QWidget):
+    def __init__(self, up_next_window, engine=None, history_depth=5):
+        super().__init__()
+        self.history_depth = max(1, history_depth)
+        self.stack_size = 0
+        self.shown_next = None
+        self.init_ui()
+        self.engine = engine or BingoEngine()
+        self.up_next_window = up_next_window
+
+    def init_ui(self):
+        main_layout = QVBoxLayout()
+
+        self.current_ball_label = QLabel("BINGO")
+        self.current_ball_label.setAlignment(Qt.AlignCenter)
+        self.current_ball_label.setFixedSize(215, 215)  # Make the label larger
+        self.current_ball_label.setProperty('ball', 'current')
+        main_layout.addWidget(self.current_ball_label, alignment=Qt.AlignCenter)
+
+        # A fixed ring of recent ball labels; each draw moves the oldest one
+        # to the top and relabels it instead of creating a new label
+        self.ball_stack = QVBoxLayout()
+        self.stack_widget = QWidget()
+        self.stack_widget.setLayout(self.ball_stack)
+        for _ in range(self.history_depth):
+            ball_label = QLabel()
+            ball_label.setAlignment(Qt.AlignCenter)
+            ball_label.setProperty('ball', 'stack')
+            ball_label.hide()
+            self.ball_stack.addWidget(ball_label)
+        main_layout.addWidget(self.stack_widget)
+
+        self.setLayout(main_layout)
+        self.setWindowTitle('Random Bingo Ball Selector')
+        self.setMinimumSize(300, 400)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    @traced('BallSelectorWindow.show_drawn')
+    def show_drawn(self, ball):
+        self.show_ball(ball)
+
+        # Show the next ball
+        self.prepare_next_ball()
+
+    def show_ball(self, ball):
+        # Ball colours come from the application stylesheet by letter, so a
+        # label is only restyled when its letter changes
+        color = letter_of(ball)
+        self.current_ball_label.setText(f"{color} {ball}")
+        if self.current_ball_label.property('letter') != color:
+            theme.restyle(self.current_ball_label, letter=color)
+
+        # Recycle the oldest label as the top of the stack
+        ball_label = self.ball_stack.itemAt(self.history_depth - 1).widget()
+        self.ball_stack.removeWidget(ball_label)
+        self.ball_stack.insertWidget(0, ball_label)
+        ball_label.setText(f"{color} {ball}")
+        if ball_label.property('letter') != color:
+            theme.restyle(ball_label, letter=color)
+        ball_label.show()
+        self.stack_size = min(self.stack_size + 1, self.history_depth)
+
+    def restore(self):
+        # Shows the engine's current state, e.g. after replaying a journal
+        recent = self.engine.recent(self.history_depth)
+        for ball in reversed(recent):
+            self.show_ball(ball)
+        if recent:
+            self.prepare_next_ball()
+
+    def prepare_next_ball(self):
+        self.shown_next = self.engine.peek()
+        self.up_next_window.update_up_next(self.shown_next)
+
+    @property
+    def selected_balls(self):
+        return {n for n in range(1, 76) if self.engine.is_called(n)}
+
+    def reset(self):
+        # The engine itself is reset by the game
+        self.current_ball_label.setText("BINGO")
+        theme.restyle(self.current_ball_label, letter='')
+        for i in range(self.ball_stack.count()):
+            self.ball_stack.itemAt(i).widget().hide()
+        self.stack_size = 0
+        self.shown_next = None
+        self.up_next_window.update_up_next(None)  # Reset up next window
+
+    def handle_manual_selection(self, ball):
+        self.handle_manual_selections((ball,))
+
+    def handle_manual_selections(self, balls):
+        # Called once the game has marked the balls
+        if self.stack_size and self.shown_next in balls:
+            self.prepare_next_ball()
+
+class DisplayWindow(QWidget):
+    numbers_toggled = pyqtSignal(frozenset, frozenset)  # newly called, newly uncalled
+
+    def __init__(self):
+        super().__init__()
+        self.init_ui()
+
+    def init_ui(self):
+        self.selected_numbers = set()
+        self._shown_numbers = set()
+        self._dirty = set()
+        self._flush_pending = False
+        main_layout = QHBoxLayout()
+
+        # Game template display (5x5 bingo card example)
+        template_layout = QVBoxLayout()
+        self.template_label = QLabel("Game:\n")
+        self.template_label.setStyleSheet("font-size: 24px;")
+        self.template_label.setWordWrap(True)  # Enable word wrapping
+        template_layout.addWidget(self.template_label)
+
+        self.pattern = None
+        self.template_card = TemplateCard(random_card())
+        self.template_card.cell_clicked.connect(lambda row, col: self.toggle_template_cell((row, col)))
+        template_layout.addWidget(self.template_card)
+
+        self.winners_label = QLabel("")
+        self.winners_label.setStyleSheet("font-size: 18px; font-weight: bold;")
+        self.winners_label.setWordWrap(True)
+        template_layout.addWidget(self.winners_label)
+        main_layout.addLayout(template_layout)
+
+        # Number display grid
+        self.board = CallBoard()
+        main_layout.addWidget(self.board, 1)
+
+        self.setLayout(main_layout)
+        self.setWindowTitle('Stevens Bingo Master Call Sheet')
+        self.setMinimumSize(1000, 600)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    @property
+    def template_mask(self):
+        return self.template_card.mask
+
+    def update_display(self, number):
+        self.update_display_many((number,))
+
+    @traced('DisplayWindow.update_display')
+    def update_display_many(self, numbers):
+        # Toggles every number; the board is updated once per event loop tick
+        numbers = ALL_NUMBERS.intersection(numbers)
+        self.selected_numbers ^= numbers
+        self._dirty |= numbers
+        self.schedule_flush()
+
+    def clear_display(self):
+        self._dirty |= self.selected_numbers
+        self.selected_numbers.clear()
+        self.schedule_flush()
+        self.clear_template()
+
+    def schedule_flush(self):
+        if not self._flush_pending and self._dirty:
+            self._flush_pending = True
+            QTimer.singleShot(0, self.flush)
+
+    @traced('DisplayWindow.flush')
+    def flush(self):
+        self._flush_pending = False
+        called = self._dirty & self.selected_numbers - self._shown_numbers
+        uncalled = self._dirty & self._shown_numbers - self.selected_numbers
+        self._dirty = set()
+        mask = self.board.called
+        for number in called:
+            mask |= 1 << number
+        for number in uncalled:
+            mask &= ~(1 << number)
+        self.board.set_called(mask)
+        self._shown_numbers = set(self.selected_numbers)
+        if called or uncalled:
+            self.numbers_toggled.emit(frozenset(called), frozenset(uncalled))
+
+    def show_winners(self, winners, limit=20):
+        if not winners:
+            self.winners_label.setText("")
+            return
+        shown = ', '.join(f"#{card}" for card in islice(winners, limit))
+        if len(winners) > limit:
+            shown += f" (+{len(winners) - limit} more)"
+        self.winners_label.setText(f"Winners:\n{shown}")
+
+    def clear_template(self):
+        self.render_template(0)
+
+    def update_game_mode(self, mode):
+        # Modes that mark the N column have the game toggle it
+        self.template_label.setText(f"Game:\n{mode}")
+        self.pattern = find_pattern(mode)
+        if self.pattern is None:
+            self.clear_template()
+            return
+
+        self.render_template(self.pattern.display)
+
+    def restore(self, mode, numbers, template_mask):
+        if mode is not None:
+            self.template_label.setText(f"Game:\n{mode}")
+            self.pattern = find_pattern(mode)
+        self.update_display_many(numbers)
+        self.render_template(template_mask)
+
+    def toggle_template_cell(self, pos):
+        self.template_card.set_mask(self.template_card.mask ^ cell(*pos))
+
+    def render_template(self, mask):
+        self.template_card.set_mask(mask)
+
+class GameSession(QObject):
+    # One game.Game shown in its own four windows. The controller is built
+    # and shown straight away; the other windows are built by
+    # startup_steps(), after which the game starts journalling, broadcasting
+    # and recording, the controller is enabled and `ready` is emitted.
+    ready = pyqtSignal()
+
+    def __init__(self, name=None, journal_path=None, broadcast_port=None, history_depth=5,
+                 session_seed=None, stats_store=None, card_workers=None):
+        super().__init__()
+        self.name = name
+        self.broadcast_port = broadcast_port
+        self.stats_store = stats_store
+        self.history_depth = history_depth
+        try:
+            self.game = Game(journal_path, session_seed, card_workers)
+        except ValueError as exc:
+            sys.exit(f"Cannot restore the game: {exc}")
+        self.engine = self.game.engine
+        self.up_next_window = None
+        self.ball_selector_window = None
+        self.display_window = None
+
+        self.control_window = ControlWindow()
+        self.show_window(self.control_window)
+        self.control_window.setEnabled(False)
+
+    def startup_steps(self):
+        return [self.build_up_next_window, self.build_ball_selector_window,
+                self.build_display_window, self.finish_startup]
+
+    def show_window(self, window):
+        if self.name:
+            window.setWindowTitle(f"{window.windowTitle()} - {self.name}")
+        self.style_window(window)
+        window.show()
+
+    def style_window(self, window):
+        colors = theme.current
+        if isinstance(window, (UpNextWindow, BallSelectorWindow)):
+            stylesheet = colors.ball_stylesheet
+        else:
+            stylesheet = colors.window_stylesheet
+        if window.styleSheet() != stylesheet:
+            window.setStyleSheet(stylesheet)
+
+    def apply_theme(self):
+        # Restyles this game's windows after theme.use() and repaints the
+        # boards with the new brushes
+        self.control_window.theme_button.setChecked(theme.current.name == 'high-contrast')
+        for window in (self.control_window, self.up_next_window, self.ball_selector_window, self.display_window):
+            if window is not None:
+                self.style_window(window)
+        if self.display_window is not None:
+            self.display_window.board.update()
+            self.display_window.template_card.update()
+
+    def build_up_next_window(self):
+        self.up_next_window = UpNextWindow()
+        self.show_window(self.up_next_window)
+
+    def build_ball_selector_window(self):
+        self.ball_selector_window = BallSelectorWindow(self.up_next_window, self.engine, self.history_depth)
+        self.show_window(self.ball_selector_window)
+
+    def build_display_window(self):
+        self.display_window = DisplayWindow()
+        self.show_window(self.display_window)
+
+    def finish_startup(self):
+        game = self.game
+        state = game.state
+        app = QApplication.instance()
+        self.control_window.number_selected.connect(lambda number: game.select((number,)))
+        self.control_window.number_selected.connect(self.ball_selector_window.handle_manual_selection)
+        self.control_window.numbers_selected.connect(game.select)
+        self.control_window.numbers_selected.connect(self.ball_selector_window.handle_manual_selections)
+        self.control_window.game_mode_selected.connect(self.set_mode)
+        self.control_window.manual_mode_entered.connect(self.set_mode)
+        self.control_window.clear_selection.connect(self.reset)
+        self.control_window.draw_ball.connect(self.draw_ball)
+        self.control_window.reset_ball_selector.connect(self.ball_selector_window.reset)
+        self.control_window.cards_file_chosen.connect(self.load_cards)
+        self.control_window.card_claimed.connect(self.verify_card)
+        self.control_window.theme_selected.connect(app.set_theme)
+        self.display_window.numbers_toggled.connect(self.update_cards)
+        self.display_window.template_card.cell_clicked.connect(
+            lambda *_: game.template(self.display_window.template_mask))
+
+        if state.cards_path:
+            self.load_cards(state.cards_path)
+        self.display_window.restore(state.mode, state.called, state.template_mask)
+        self.ball_selector_window.restore()
+        # The call sheet batches toggles and hands them back through
+        # numbers_toggled
+        game.call_sheet = self.display_window.update_display_many
+
+        broadcast = None
+        if self.broadcast_port is not None:
+            from broadcast import BroadcastServer
+            broadcast = BroadcastServer(port=self.broadcast_port)
+            broadcast.snapshot.recent_size = self.history_depth
+        game.start(broadcast, None if self.stats_store is None else self.stats_store.room(self.name))
+        if game.journal is not None:
+            self.sync_timer = QTimer()
+            self.sync_timer.timeout.connect(game.journal.sync)
+            self.sync_timer.start(1000)
+            app.aboutToQuit.connect(game.close)
+        if broadcast is not None:
+            broadcast.start()
+            app.aboutToQuit.connect(broadcast.stop)
+
+        # Event filters see every event of their widget, so they are only
+        # installed when tracing was turned on before startup
+        self.paint_probes = []
+        if tracer.enabled:
+            self.paint_probes = [
+                PaintProbe('ControlWindow', self.control_window),
+                PaintProbe('BallSelectorWindow', self.ball_selector_window.current_ball_label),
+                PaintProbe('UpNextWindow', self.up_next_window.up_next_ball),
+                PaintProbe('DisplayWindow', self.display_window.board),
+            ]
+
+        self.control_window.setEnabled(True)
+        self.ready.emit()
+
+    def draw_ball(self):
+        ball = self.game.draw()
+        if ball is not None:
+            self.ball_selector_window.show_drawn(ball)
+
+    def set_mode(self, mode):
+        self.display_window.update_game_mode(mode)
+        self.game.set_mode(mode)
+        self.display_window.show_winners(self.game.card_pool.winners)
+
+    def reset(self):
+        self.game.reset()
+        self.display_window.clear_display()
+        self.display_window.show_winners(self.game.card_pool.winners)
+
+    def update_cards(self, called, uncalled):
+        self.game.toggled(called, uncalled)
+        self.display_window.show_winners(self.game.card_pool.winners)
+
+    def load_cards(self, path):
+        try:
+            self.game.load_cards(path)
+        except (OSError, ValueError) as exc:
+            QMessageBox.warning(self.control_window, 'Load Cards', str(exc))
+            return
+        self.display_window.show_winners(self.game.card_pool.winners)
+
+    def verify_card(self, card_number):
+        card_pool = self.game.card_pool
+        if card_pool.pattern is None:
+            result = "No game pattern is selected."
+        elif card_number > len(card_pool):
+            result = f"Card #{card_number} is not loaded."
+        else:
+            try:
+                winner = self.game.verify(card_number)
+            except WorkerError as exc:
+                QMessageBox.warning(self.control_window, 'Verify Card', f"Cards cannot be checked: {exc}")
+                return
+            result = f"Card #{card_number} is {'' if winner else 'not '}a winner."
+        QMessageBox.information(self.control_window, 'Verify Card', result)
+
+
+class BingoApp(QApplication):
+    # Hosts one game, or one GameSession per name in `games`, all sharing the
+    # theme, pattern masks and statistics database and, with card_workers,
+    # one pool of card checking processes. With lazy=True only the
+    # controllers are built before the event loop starts; the other windows
+    # are built one per event loop tick after that. `ready` is emitted once
+    # every game is built.
+    ready = pyqtSignal()
+
+    def __init__(self, sys_argv, journal_path=None, broadcast_port=None, history_depth=5, lazy=False,
+                 session_seed=None, stats_path=None, games=None, card_workers=0, theme_name=None):
+        super().__init__(sys_argv)
+        if theme_name is not None:
+            theme.use(theme_name)
+        self.card_workers = None
+        if card_workers:
+            self.card_workers = CardWorkers(card_workers)
+            self.aboutToQuit.connect(self.card_workers.close)
+        self.stats_store = None
+        if stats_path:
+            from history import HistoryStore
+            self.stats_store = HistoryStore(stats_path)
+            self.aboutToQuit.connect(self.stats_store.close)
+
+        self.sessions = []
+        for index, name in enumerate(games or [None]):
+            self.sessions.append(GameSession(
+                name, session_path(journal_path, name),
+                None if broadcast_port is None else broadcast_port + index, history_depth,
+                None if session_seed is None else session_seed + index,
+                self.stats_store, self.card_workers))
+        self.session = self.sessions[0]
+
+        self._startup_steps = [step for session in self.sessions for step in session.startup_steps()]
+        if lazy:
+            QTimer.singleShot(0, self.run_startup_step)
+        else:
+            while self._startup_steps:
+                self._startup_steps.pop(0)()
+            self.ready.emit()
+
+    def run_startup_step(self):
+        self._startup_steps.pop(0)()
+        if self._startup_steps:
+            QTimer.singleShot(0, self.run_startup_step)
+        else:
+            self.ready.emit()
+
+    def set_theme(self, name):
+        if name != theme.current.name:
+            theme.use(name)
+            for session in self.sessions:
+                session.apply_theme()
@@ -0,0 +1,89 @@
+import shlex
+import sys
+
+from engine import letter_of
+from game import Game
+from host import WorkerError
+
+
+class HeadlessGame(Game):
+    # A game without any windows, started straight away, for the console
+    # and for scripts
+
+    def __init__(self, journal_path=None, broadcast=None, session_seed=None, stats=None, card_workers=None):
+        super().__init__(journal_path, session_seed, card_workers)
+        if self.state.cards_path:
+            self.load_cards(self.state.cards_path)
+        self.start(broadcast, stats)
+
+
+COMMANDS = '''Commands:
+  draw [COUNT]        call the next ball(s)
+  select N [N ...]    toggle numbers on the call sheet
+  mode NAME           choose a game mode
+  cards PATH          load a card or deck file
+  verify CARD         check a claim
+  winners             list the winning cards
+  state               show the board
+  reset               start a new game
+  games               list the games hosted here
+  game NAME           send the following commands to another game
+  quit'''
+
+
+def run_console(game, lines=sys.stdin, out=sys.stdout, games=None):
+    # A line based interface for scripting: one command per line. With
+    # several games hosted, `games` maps their names to them and `game NAME`
+    # picks the one that receives commands.
+    games = games or {}
+    for line in lines:
+        try:
+            words = shlex.split(line)
+        except ValueError as exc:
+            print(f"error: {exc}", file=out)
+            continue
+        if not words:
+            continue
+        command, args = words[0].lower(), words[1:]
+        try:
+            if command == 'draw':
+                for _ in range(int(args[0]) if args else 1):
+                    ball = game.draw()
+                    print(f"{letter_of(ball)} {ball}" if ball is not None else "no balls left", file=out)
+            elif command == 'select':
+                game.select(int(n) for n in args)
+            elif command == 'mode':
+                game.set_mode(' '.join(args))
+            elif command == 'cards':
+                game.load_cards(args[0])
+                print(f"{len(game.card_pool)} cards loaded", file=out)
+            elif command == 'verify':
+                card_number = int(args[0])
+                print(f"card #{card_number} is {'' if game.verify(card_number) else 'not '}a winner", file=out)
+            elif command == 'winners':
+                print(' '.join(f"#{card}" for card in game.card_pool.winners) or "no winners", file=out)
+            elif command == 'state':
+                up_next = game.engine.peek()
+                print(f"game: {game.engine.game_number} of session {game.engine.session_seed}", file=out)
+                print(f"mode: {game.state.mode or '-'}", file=out)
+                print(f"called: {' '.join(str(n) for n in sorted(game.state.called))}", file=out)
+                print(f"up next: {f'{letter_of(up_next)} {up_next}' if up_next else '-'}", file=out)
+            elif command == 'reset':
+                game.reset()
+            elif command == 'games':
+                for name, hosted in games.items():
+                    current = '*' if hosted is game else ' '
+                    print(f"{current} {name}: game {hosted.engine.game_number}, {hosted.state.mode or '-'}, "
+                          f"{len(hosted.state.called)} called", file=out)
+            elif command == 'game':
+                name = ' '.join(args)
+                if name not in games:
+                    raise ValueError(f"no game named {name!r}")
+                game = games[name]
+            elif command in ('quit', 'exit'):
+                break
+            else:
+                print(COMMANDS, file=out)
+        except (IndexError, ValueError, OSError, WorkerError) as exc:
+            print(f"error: {exc}", file=out)
+        out.flush()
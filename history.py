@@ -0,0 +1,346 @@
+import argparse
+import csv
+import logging
+import queue
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+
+from engine import letter_of
+
+# Long-term record of every game in a local SQLite file. The app only puts
+# rows on a queue; a writer thread commits them in batches, so nothing on the
+# UI thread waits on the disk. Queries open their own connection.
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    session_seed INTEGER NOT NULL,
+    game_number INTEGER NOT NULL,
+    mode TEXT,
+    started REAL NOT NULL,
+    ended REAL,
+    calls INTEGER,
+    room TEXT  -- name of the game when one process hosts several
+);
+CREATE TABLE IF NOT EXISTS calls (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    call_index INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    letter TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS claims (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    card INTEGER NOT NULL,
+    mode TEXT,
+    calls INTEGER NOT NULL,
+    winner INTEGER NOT NULL,
+    at REAL NOT NULL
+);
+-- Calls per number per day, kept up to date with every call so frequency
+-- queries read at most 75 rows per day instead of every call
+CREATE TABLE IF NOT EXISTS daily_counts (
+    day INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, day, number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS games_by_seed ON games (session_seed, game_number, room);
+CREATE INDEX IF NOT EXISTS games_by_start ON games (started);
+CREATE INDEX IF NOT EXISTS calls_by_game ON calls (game_id, call_index);
+CREATE INDEX IF NOT EXISTS calls_by_time ON calls (at);
+CREATE INDEX IF NOT EXISTS claims_by_mode ON claims (mode, winner, at, game_id, calls);
+'''
+
+TABLES = ('games', 'calls', 'claims')
+DAY = 86400
+
+_FLUSH = object()
+_STOP = object()
+
+log = logging.getLogger(__name__)
+
+
+def connect(path):
+    db = sqlite3.connect(path)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    return db
+
+
+class HistoryStore:
+    # One database shared by every game in the process. Each game records
+    # through its own GameHistory from room(). Game ids are handed out here
+    # rather than by SQLite so that calls can be queued for a game before its
+    # row has been written. They are random, so processes sharing the file
+    # (one app per room, or --no-gui next to the GUI) never hand out the
+    # same one.
+
+    def __init__(self, path, batch_size=500, batch_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        with connect(path) as db:
+            db.executescript(SCHEMA)
+        db.close()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='bingo-history', daemon=True)
+        self._thread.start()
+
+    def room(self, name=None):
+        return GameHistory(self, name)
+
+    def new_game_id(self):
+        # 63 bits: a positive SQLite integer
+        return secrets.randbits(63) or 1
+
+    def latest_game(self, session_seed, game_number, room):
+        # Id of the latest row for this game, or None. Reads the database, so
+        # it is meant for startup only.
+        self.flush()
+        with connect(self.path) as db:
+            row = db.execute('SELECT id FROM games WHERE session_seed = ? AND game_number = ? AND room IS ? '
+                             'ORDER BY started DESC LIMIT 1', (_signed(session_seed), game_number, room)).fetchone()
+        db.close()
+        return row and row[0]
+
+    def flush(self):
+        # Blocks until everything queued so far is committed or has failed
+        if self._thread.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def write(self, sql, params):
+        self._queue.put((sql, params))
+
+    def _run(self):
+        db = connect(self.path)
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_interval
+            while batch[-1] not in (_FLUSH, _STOP) and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            try:
+                self._commit(db, [item for item in batch if item is not _FLUSH and item is not _STOP])
+            finally:
+                # Always, so flush() and close() never wait on a lost batch
+                for _ in batch:
+                    self._queue.task_done()
+        db.close()
+
+    def _commit(self, db, items):
+        try:
+            with db:
+                for item in items:
+                    db.execute(*item)
+            return
+        except sqlite3.Error:
+            pass
+        # Something in the batch failed and the batch was rolled back; write
+        # the rows one at a time so only the bad ones are lost
+        failed = []
+        for item in items:
+            try:
+                with db:
+                    db.execute(*item)
+            except sqlite3.Error as exc:
+                failed.append(exc)
+        if failed:
+            log.error('Could not write %d of %d history rows to %s: %s', len(failed), len(items), self.path, failed[0])
+
+
+class GameHistory:
+    # The games of one room, written through the shared HistoryStore
+
+    def __init__(self, store, room=None):
+        self.store = store
+        self.room = room
+        self.game_id = None
+        self.mode = None
+
+    def start_game(self, session_seed, game_number, mode=None, resume=False):
+        # With resume, carries on with the latest row for this game if there
+        # is one, e.g. after the app restarts from its journal
+        self.mode = mode
+        if resume:
+            game_id = self.store.latest_game(session_seed, game_number, self.room)
+            if game_id is not None:
+                self.game_id = game_id
+                self.set_mode(mode)
+                return self.game_id
+        self.game_id = self.store.new_game_id()
+        self.store.write('INSERT INTO games (id, session_seed, game_number, mode, started, room) '
+                          'VALUES (?, ?, ?, ?, ?, ?)',
+                          (self.game_id, _signed(session_seed), game_number, mode, time.time(), self.room))
+        return self.game_id
+
+    def end_game(self, calls):
+        if self.game_id is not None:
+            self.store.write('UPDATE games SET ended = ?, calls = ? WHERE id = ?', (time.time(), calls, self.game_id))
+            self.game_id = None
+
+    def set_mode(self, mode):
+        self.mode = mode
+        if self.game_id is not None:
+            self.store.write('UPDATE games SET mode = ? WHERE id = ?', (mode, self.game_id))
+
+    def call(self, number, call_index, kind='draw'):
+        if self.game_id is not None:
+            at = time.time()
+            self.store.write('INSERT INTO calls VALUES (?, ?, ?, ?, ?, ?)',
+                              (self.game_id, call_index, number, letter_of(number), kind, at))
+            self.store.write('INSERT INTO daily_counts VALUES (?, ?, ?, 1) '
+                              'ON CONFLICT (kind, day, number) DO UPDATE SET count = count + 1',
+                              (int(at // DAY), kind, number))
+
+    def select(self, numbers, call_index):
+        for number in sorted(numbers):
+            self.call(number, call_index, 'select')
+
+    def claim(self, card, calls, winner):
+        if self.game_id is not None:
+            self.store.write('INSERT INTO claims VALUES (?, ?, ?, ?, ?, ?)',
+                              (self.game_id, card, self.mode, calls, int(winner), time.time()))
+
+
+def _signed(seed):
+    # SQLite integers are signed 64-bit; session seeds are unsigned
+    return seed - (1 << 64) if seed >= 1 << 63 else seed
+
+
+def _since(days):
+    return 0 if days is None else time.time() - days * DAY
+
+
+def average_calls_to_win(path, mode, days=None, room=None):
+    # Mean number of calls before the first winning claim over the games of
+    # this mode in the last `days` days, in every room or in just `room`, and
+    # how many games that covers
+    in_room = '' if room is None else 'AND game_id IN (SELECT id FROM games WHERE room = ?)'
+    with connect(path) as db:
+        row = db.execute(f'''SELECT AVG(calls), COUNT(*) FROM (
+                                 SELECT MIN(calls) AS calls FROM claims
+                                 WHERE mode = ? AND winner = 1 AND at >= ? {in_room} GROUP BY game_id)''',
+                         (mode, _since(days)) + (() if room is None else (room,))).fetchone()
+    db.close()
+    return row[0], row[1]
+
+
+def number_frequency(path, days=None, kind='draw'):
+    # How often each number was called, as {number: count}, counting whole
+    # days
+    with connect(path) as db:
+        rows = db.execute('SELECT number, SUM(count) FROM daily_counts WHERE kind = ? AND day >= ? GROUP BY number',
+                          (kind, int(_since(days) // DAY))).fetchall()
+    db.close()
+    counts = dict.fromkeys(range(1, 76), 0)
+    counts.update(rows)
+    return counts
+
+
+def _rows(path, table, days=None):
+    # Yields the columns as (name, type) pairs and then batches of rows,
+    # oldest first
+    if table not in TABLES:
+        raise ValueError(f"unknown table {table!r}, expected one of {', '.join(TABLES)}")
+    column = 'started' if table == 'games' else 'at'
+    db = connect(path)
+    try:
+        yield [(name, kind) for _, name, kind, *_ in db.execute(f'PRAGMA table_info({table})')]
+        cursor = db.execute(f'SELECT * FROM {table} WHERE {column} >= ? ORDER BY {column}', (_since(days),))
+        while True:
+            rows = cursor.fetchmany(65536)
+            if not rows:
+                break
+            yield rows
+    finally:
+        db.close()
+
+
+def export_csv(path, table, out_path, days=None):
+    batches = _rows(path, table, days)
+    count = 0
+    with open(out_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(name for name, _ in next(batches))
+        for rows in batches:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def export_parquet(path, table, out_path, days=None):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('Parquet export needs pyarrow (pip install pyarrow)') from None
+    types = {'INTEGER': pyarrow.int64(), 'REAL': pyarrow.float64(), 'TEXT': pyarrow.string()}
+    batches = _rows(path, table, days)
+    schema = pyarrow.schema([(name, types[kind]) for name, kind in next(batches)])
+    count = 0
+    with pyarrow.parquet.ParquetWriter(out_path, schema) as writer:
+        for rows in batches:
+            columns = zip(*rows)
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, field.type) for column, field in zip(columns, schema)], schema=schema))
+            count += len(rows)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query and export the game history.')
+    parser.add_argument('--db', default='bingo-history.sqlite3', help='history database')
+    commands = parser.add_subparsers(dest='command', required=True)
+    average = commands.add_parser('average', help='average calls to the first winner of a mode')
+    average.add_argument('mode')
+    average.add_argument('--days', type=float)
+    average.add_argument('--room', help='only the games hosted under this name (default: every room)')
+    frequency = commands.add_parser('frequency', help='how often each number was drawn')
+    frequency.add_argument('--days', type=float)
+    export = commands.add_parser('export', help='write a table to CSV or Parquet')
+    export.add_argument('table', choices=TABLES)
+    export.add_argument('out')
+    export.add_argument('--format', choices=('csv', 'parquet'), help='default: from the file extension')
+    export.add_argument('--days', type=float)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == 'average':
+        mean, games = average_calls_to_win(args.db, args.mode, args.days, args.room)
+        if mean is None:
+            print(f"No winning claims for {args.mode}")
+        else:
+            print(f"{args.mode}: {mean:.1f} calls to the first winner over {games} games")
+    elif args.command == 'frequency':
+        counts = number_frequency(args.db, args.days)
+        for number, count in counts.items():
+            print(f"{letter_of(number)}{number:<4}{count}")
+    else:
+        fmt = args.format or ('parquet' if args.out.endswith('.parquet') else 'csv')
+        try:
+            export = export_parquet if fmt == 'parquet' else export_csv
+            count = export(args.db, args.table, args.out, args.days)
+        except ImportError as exc:
+            sys.exit(str(exc))
+        print(f"Wrote {count} {args.table} rows to {args.out}")
+    print(f"({(time.perf_counter() - started) * 1000:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
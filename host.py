@@ -0,0 +1,292 @@
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import weakref
+
+from cards import CardPool, check_card
+from deck import RECORD_SIZE, pack_card, unpack_card
+from patterns import find_pattern
+
+# Support for hosting several games from one process. Pattern masks and
+# window styles are module level, so every game already shares them; what
+# is added here is one pool of card checking processes for all the games.
+
+log = logging.getLogger(__name__)
+
+
+class WorkerError(RuntimeError):
+    # A card worker process has died, so its shard of every pool is gone
+    pass
+
+
+def game_slug(name):
+    # The part of a game's file names that comes from its name
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'game'
+
+
+def session_path(path, name):
+    # Per-game file next to `path`, e.g. bingo.journal -> bingo-main-hall.journal
+    if path is None or name is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}-{game_slug(name)}{ext}"
+
+
+def _pattern_ref(pattern):
+    # Built-in and compiled patterns travel by name, so workers use their own
+    # cached copy
+    if pattern is not None and find_pattern(pattern.name) is pattern:
+        return pattern.name
+    return pattern
+
+
+def _pattern(ref):
+    return find_pattern(ref) if isinstance(ref, str) else ref
+
+
+def _worker(conn):
+    # Holds this worker's shard of every shared card pool, keyed by pool id
+    pools = {}
+    while True:
+        try:
+            op, pool_id, arg = conn.recv()
+        except EOFError:
+            return
+        if op == 'stop':
+            return
+        try:
+            pool = pools.get(pool_id)
+            if op == 'add':
+                pattern, called, records = arg
+                if pool is None:
+                    pool = pools[pool_id] = CardPool(pattern=_pattern(pattern))
+                    pool.call_many(number for number in range(1, 76) if called >> number & 1)
+                before = len(pool.winners)
+                for offset in range(0, len(records), RECORD_SIZE):
+                    pool.add(unpack_card(records[offset:offset + RECORD_SIZE]))
+                result = list(pool.winners.items())[before:]
+            elif pool is None:
+                result = None
+            elif op == 'call':
+                result = [(card, pool.winners[card]) for card in pool.call_many(arg)]
+            elif op == 'uncall':
+                before = set(pool.winners)
+                pool.uncall_many(arg)
+                result = before.difference(pool.winners)
+            elif op == 'pattern':
+                pool.set_pattern(_pattern(arg))
+                result = list(pool.winners.items())
+            elif op == 'reset':
+                pool.reset_calls()
+                result = None
+            elif op == 'verify':
+                result = pool.verify(arg)
+            elif op == 'drop':
+                result = pools.pop(pool_id, None) is not None
+            else:
+                raise ValueError(f"unknown card worker op {op!r}")
+        except Exception as exc:
+            result = exc
+        conn.send(result)
+
+
+class CardWorkers:
+    # A fixed set of worker processes shared by every game in the process.
+    # Each holds one shard of every SharedCardPool, so a call is checked on
+    # all cores at once and one round trip covers a whole batch of numbers.
+
+    def __init__(self, size=None):
+        self.size = size or os.cpu_count()
+        context = multiprocessing.get_context('spawn')  # never fork a process that runs Qt
+        self._conns = []
+        self._processes = []
+        for _ in range(self.size):
+            conn, child = context.Pipe()
+            process = context.Process(target=_worker, args=(child,), name='bingo-cards', daemon=True)
+            process.start()
+            child.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self.dead = False
+
+    def new_pool_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def run(self, pool_id, requests):
+        # requests maps shard -> (op, arg); returns shard -> result. Once a
+        # worker has died every call raises WorkerError.
+        with self._lock:
+            if self.dead:
+                raise WorkerError('card worker processes have stopped')
+            try:
+                for shard, (op, arg) in requests.items():
+                    self._conns[shard].send((op, pool_id, arg))
+                results = {shard: self._conns[shard].recv() for shard in requests}
+            except (EOFError, OSError) as exc:
+                self.dead = True
+                raise WorkerError(f"a card worker process has stopped ({exc or type(exc).__name__})") from exc
+        for result in results.values():
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def run_all(self, pool_id, op, arg=None):
+        return self.run(pool_id, {shard: (op, arg) for shard in range(self.size)})
+
+    def drop(self, pool_id):
+        # Called by finalizers, possibly at exit, so it never raises
+        if self._processes and not self.dead:
+            try:
+                self.run_all(pool_id, 'drop')
+            except WorkerError:
+                pass
+
+    def close(self):
+        with self._lock:
+            for conn in self._conns:
+                try:
+                    conn.send(('stop', None, None))
+                except OSError:
+                    pass  # already gone
+            self.dead = True
+        for process in self._processes:
+            process.join()
+        self._processes = []
+
+
+class SharedCardPool:
+    # CardPool with its cards spread over CardWorkers: card n lives in shard
+    # (n - 1) % size. Cards are sent to the workers in batches as they are
+    # added; winners are gathered back so `winners` reads like CardPool's.
+    # Until a card is added nothing is sent to the workers at all. If the
+    # workers die the pool logs it once, keeps its last winners and sets
+    # `error`; verify() raises WorkerError.
+
+    BATCH = 8192
+
+    def __init__(self, workers, cards=(), pattern=None):
+        self.workers = workers
+        self.pattern = pattern
+        self.called = 0
+        self.winners = {}
+        self.error = None
+        self._count = 0
+        self._pending = [bytearray() for _ in range(workers.size)]
+        self._pending_count = 0
+        self._id = workers.new_pool_id()
+        weakref.finalize(self, workers.drop, self._id)
+        for card in cards:
+            self.add(card)
+
+    def __len__(self):
+        return self._count
+
+    def _card_number(self, shard, local):
+        return (local - 1) * self.workers.size + shard + 1
+
+    def _run(self, requests):
+        if self.error is None:
+            try:
+                return self.workers.run(self._id, requests)
+            except WorkerError as exc:
+                self.error = str(exc)
+                log.error('Card checking stopped: %s', exc)
+        return {}
+
+    def _run_all(self, op, arg=None):
+        return self._run({shard: (op, arg) for shard in range(self.workers.size)})
+
+    def _gather(self, results):
+        # Merges (local card, calls) pairs from each shard into winners and
+        # returns the new winners
+        new_winners = []
+        for shard, pairs in sorted(results.items()):
+            for local, calls in pairs or ():
+                card_number = self._card_number(shard, local)
+                self.winners[card_number] = calls
+                new_winners.append(card_number)
+        return new_winners
+
+    def add(self, card):
+        self._count += 1
+        check_card(card, self._count)
+        self._pending[(self._count - 1) % self.workers.size] += pack_card(card)
+        self._pending_count += 1
+        if self._pending_count >= self.BATCH:
+            self._flush()
+        return self._count
+
+    def _flush(self):
+        if not self._pending_count:
+            return
+        pattern = _pattern_ref(self.pattern)
+        requests = {shard: ('add', (pattern, self.called, bytes(records))) for shard, records in enumerate(self._pending) if records}
+        self._pending = [bytearray() for _ in range(self.workers.size)]
+        self._pending_count = 0
+        self._gather(self._run(requests))
+
+    def call(self, number):
+        return self.call_many((number,))
+
+    def call_many(self, numbers):
+        # Returns the cards that became winners with these calls
+        self._flush()
+        numbers = [number for number in numbers if not self.called >> number & 1]
+        for number in numbers:
+            self.called |= 1 << number
+        if not numbers or not self._count:
+            return []
+        return self._gather(self._run_all('call', numbers))
+
+    def uncall(self, number):
+        self.uncall_many((number,))
+
+    def uncall_many(self, numbers):
+        self._flush()
+        numbers = [number for number in numbers if self.called >> number & 1]
+        for number in numbers:
+            self.called &= ~(1 << number)
+        if not numbers or not self._count:
+            return
+        for shard, removed in self._run_all('uncall', numbers).items():
+            for local in removed or ():
+                del self.winners[self._card_number(shard, local)]
+
+    def set_pattern(self, pattern):
+        self._flush()
+        self.pattern = pattern
+        if not self._count:
+            return
+        results = self._run_all('pattern', _pattern_ref(pattern))
+        if not results:
+            return
+        winners = {}
+        for shard, pairs in results.items():
+            for local, calls in pairs or ():
+                winners[self._card_number(shard, local)] = calls
+        self.winners = dict(sorted(winners.items()))
+
+    def reset_calls(self):
+        self._flush()
+        self.called = 0
+        self.winners = {}
+        if self._count:
+            self._run_all('reset')
+
+    def verify(self, card_number):
+        self._flush()
+        if not 1 <= card_number <= self._count:
+            raise IndexError(f"no card {card_number} in the pool")
+        if self.error is not None:
+            raise WorkerError(self.error)
+        shard = (card_number - 1) % self.workers.size
+        local = (card_number - 1) // self.workers.size + 1
+        results = self._run({shard: ('verify', local)})
+        if not results:
+            raise WorkerError(self.error)
+        return bool(results[shard])
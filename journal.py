@@ -0,0 +1,345 @@
+import argparse
+import glob
+import os
+import re
+import struct
+import sys
+import time
+from datetime import datetime
+
+from engine import BingoEngine, letter_of
+from patterns import find_pattern
+
+# Append-only game journal. The file starts with MAGIC and then holds one
+# record per event: an op byte, a timestamp and an op specific payload.
+# When a game starts after a reset the file is archived as a segment next to
+# it (bingo.journal -> bingo-20260101-193000.journal) and a new file is begun
+# with one SEGMENT record carrying what outlives a reset, so startup only
+# ever replays the current game.
+MAGIC = b'BJNL\x01'
+RECORD = struct.Struct('<Bd')  # op, time.time()
+
+DRAW = 1  # ball, up next ball (0 for none)
+SELECT = 2  # 80-bit mask of toggled numbers, up next ball
+MODE = 3  # game mode text
+TEMPLATE = 4  # 25-bit template card mask
+RESET = 5
+CARDS = 6  # path of the loaded card file
+GAME = 7  # session seed and game number the draw sequence comes from
+SEGMENT = 8  # first record of a segment: session seed, game number, mode and card file path ('' for none)
+
+OP_NAMES = {DRAW: 'draw', SELECT: 'select', MODE: 'mode', TEMPLATE: 'template', RESET: 'reset', CARDS: 'cards',
+            GAME: 'game', SEGMENT: 'segment'}
+N_COLUMN = frozenset(range(31, 46))
+
+
+def _pack_text(text):
+    data = text.encode('utf-8')
+    return struct.pack('<H', len(data)) + data
+
+
+def _unpack_text(data, offset):
+    # Returns the text and the offset after it, or None for a torn record
+    length, = struct.unpack_from('<H', data, offset)
+    if offset + 2 + length > len(data):
+        return None
+    return data[offset + 2:offset + 2 + length].decode('utf-8'), offset + 2 + length
+
+
+def _numbers_mask(numbers):
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+
+class Journal:
+    # Every record is flushed to the OS as soon as it is written, so closing
+    # or crashing the app loses nothing; fsync is batched to at most one per
+    # sync_interval seconds, with sync() for the stragglers. `state` is the
+    # JournalState replayed from the file (replayed here when not given), so
+    # the journal knows where the complete records end and what to carry
+    # into the next segment.
+
+    def __init__(self, path, sync_interval=0.5, state=None):
+        self.path = path
+        self.sync_interval = sync_interval
+        if state is None:
+            state = replay(path)
+        # New records go after the last complete one, not after the torn
+        # remains of a record a crash cut short
+        if os.path.exists(path) and os.path.getsize(path) > state.end:
+            os.truncate(path, state.end)
+        self._open()
+        self._mode = state.mode
+        self._cards_path = state.cards_path
+        self._after_reset = state.last_op == RESET
+
+    def _open(self):
+        self._file = open(self.path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+        self._last_sync = time.monotonic()
+        self._unsynced = False
+
+    def draw(self, ball, next_number):
+        self._append(DRAW, struct.pack('<BB', ball, next_number or 0))
+
+    def select(self, numbers, next_number):
+        self._append(SELECT, _numbers_mask(numbers).to_bytes(10, 'little') + bytes([next_number or 0]))
+
+    def mode(self, mode):
+        self._mode = mode
+        self._append(MODE, _pack_text(mode))
+
+    def template(self, mask):
+        self._append(TEMPLATE, struct.pack('<I', mask))
+
+    def reset(self):
+        self._append(RESET, b'')
+        self._after_reset = True
+
+    def cards(self, path):
+        self._cards_path = path
+        self._append(CARDS, _pack_text(path))
+
+    def game(self, session_seed, game_number):
+        if self._after_reset:
+            self._rotate(session_seed, game_number)
+        else:
+            self._append(GAME, struct.pack('<QI', session_seed, game_number))
+
+    def _rotate(self, session_seed, game_number):
+        # The new segment is written in full before the old one is archived
+        pending = self.path + '.new'
+        with open(pending, 'wb') as f:
+            f.write(MAGIC + RECORD.pack(SEGMENT, time.time()) + struct.pack('<QI', session_seed, game_number)
+                    + _pack_text(self._mode or '') + _pack_text(self._cards_path or ''))
+            f.flush()
+            os.fsync(f.fileno())
+        self.close()
+        os.replace(self.path, archive_path(self.path))
+        os.replace(pending, self.path)
+        self._open()
+        self._after_reset = False
+
+    def _append(self, op, payload):
+        self._after_reset = False
+        self._file.write(RECORD.pack(op, time.time()) + payload)
+        self._file.flush()
+        self._unsynced = True
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = False
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self._file.close()
+
+
+def archive_path(path):
+    root, ext = os.path.splitext(path)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    archive = f"{root}-{stamp}{ext}"
+    count = 1
+    while os.path.exists(archive):
+        count += 1
+        archive = f"{root}-{stamp}-{count}{ext}"
+    return archive
+
+
+def segments(path):
+    # The archived segments of a journal, oldest first, and then the journal
+    root, ext = os.path.splitext(path)
+    name = re.compile(re.escape(root) + r'-(\d{8}-\d{6})(?:-(\d+))?' + re.escape(ext) + '$')
+    archived = []
+    for candidate in glob.glob(glob.escape(root) + '-*' + glob.escape(ext)):
+        match = name.match(candidate)
+        if match:
+            archived.append((match.group(1), int(match.group(2) or 1), candidate))
+    return [candidate for *_, candidate in sorted(archived)] + [path]
+
+
+def _finish_rotation(path):
+    # A crash between archiving a segment and putting the new one in place
+    # leaves only the new one, under a temporary name
+    pending = path + '.new'
+    if not os.path.exists(path) and os.path.exists(pending):
+        os.replace(pending, path)
+
+
+def read_journal(path):
+    # Yields (op, timestamp, value) and stops quietly at a torn final record
+    for op, timestamp, value, _ in _records(path):
+        yield op, timestamp, value
+
+
+def _records(path):
+    # read_journal() with the offset each record ends at
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        if MAGIC.startswith(data):
+            return  # a crash while the file was being created
+        raise ValueError(f"{path}: not a game journal")
+    offset = len(MAGIC)
+    try:
+        while offset < len(data):
+            op, timestamp = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            if op == DRAW:
+                value = struct.unpack_from('<BB', data, offset)
+                offset += 2
+            elif op == SELECT:
+                if offset + 11 > len(data):
+                    return
+                mask = int.from_bytes(data[offset:offset + 10], 'little')
+                value = (frozenset(n for n in range(1, 76) if mask >> n & 1), data[offset + 10])
+                offset += 11
+            elif op in (MODE, CARDS):
+                text = _unpack_text(data, offset)
+                if text is None:
+                    return
+                value, offset = text
+            elif op == TEMPLATE:
+                value, = struct.unpack_from('<I', data, offset)
+                offset += 4
+            elif op == RESET:
+                value = None
+            elif op == GAME:
+                value = struct.unpack_from('<QI', data, offset)
+                offset += 12
+            elif op == SEGMENT:
+                session_seed, game_number = struct.unpack_from('<QI', data, offset)
+                mode = _unpack_text(data, offset + 12)
+                cards = mode and _unpack_text(data, mode[1])
+                if not cards:
+                    return
+                value = (session_seed, game_number, mode[0] or None, cards[0] or None)
+                offset = cards[1]
+            else:
+                raise ValueError(f"{path}: unknown journal op {op} at byte {offset - RECORD.size}")
+            yield op, timestamp, value, offset
+    except struct.error:
+        return
+
+
+class JournalState:
+    # The game as the windows show it, rebuilt by replaying journal records
+    # with the same rules the windows apply to the live events
+
+    def __init__(self):
+        self.engine = BingoEngine()
+        self.called = set()  # numbers marked on the call sheet
+        self.mode = None
+        self.template_mask = 0
+        self.cards_path = None
+        self.seeded = False  # whether the journal recorded the current game's seed
+        self.last_op = None
+        self.end = 0  # size of the journal up to the end of its last complete record
+
+    def apply(self, op, value):
+        self.last_op = op
+        if op == DRAW:
+            ball, _ = value
+            self.engine.replay_draw(ball)
+            self.called ^= {ball}
+        elif op == SELECT:
+            numbers, _ = value
+            self.engine.mark_many(numbers)
+            self.called ^= numbers
+        elif op == MODE:
+            self.mode = value
+            pattern = find_pattern(value)
+            self.template_mask = pattern.display if pattern else 0
+            if pattern is not None and pattern.marks_n_column:
+                self.called ^= N_COLUMN
+        elif op == TEMPLATE:
+            self.template_mask = value
+        elif op == RESET:
+            self.engine.reset()
+            self.called.clear()
+            self.template_mask = 0
+            self.seeded = False
+        elif op == CARDS:
+            self.cards_path = value
+        elif op == GAME:
+            self.engine.start_session(*value)
+            self.seeded = True
+        elif op == SEGMENT:
+            # The state right after a reset, which a new segment starts from
+            session_seed, game_number, self.mode, self.cards_path = value
+            self.called.clear()
+            self.template_mask = 0
+            self.engine.start_session(session_seed, game_number)
+            self.seeded = True
+
+
+def replay(path):
+    # A journal that does not exist yet replays to a new game
+    _finish_rotation(path)
+    state = JournalState()
+    if os.path.exists(path):
+        state.end = len(MAGIC) if os.path.getsize(path) >= len(MAGIC) else 0
+        for op, _, value, end in _records(path):
+            state.apply(op, value)
+            state.end = end
+    return state
+
+
+def describe(op, value):
+    if op == DRAW:
+        ball, next_number = value
+        return f"draw {letter_of(ball)} {ball}" + (f" (up next {letter_of(next_number)} {next_number})" if next_number else "")
+    if op == SELECT:
+        return "select " + ' '.join(str(n) for n in sorted(value[0]))
+    if op == TEMPLATE:
+        return f"template {value:025b}"
+    if op == GAME:
+        return f"game {value[1]} of session {value[0]}"
+    if op == SEGMENT:
+        session_seed, game_number, mode, cards_path = value
+        return (f"segment: game {game_number} of session {session_seed}, mode {mode or '-'}"
+                + (f", cards {cards_path}" if cards_path else ""))
+    if value is None:
+        return OP_NAMES[op]
+    return f"{OP_NAMES[op]} {value}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Print the audit trail and final state of a game journal.')
+    parser.add_argument('path')
+    parser.add_argument('--quiet', action='store_true', help='only print the final state')
+    parser.add_argument('--all', action='store_true', help='start from the oldest archived segment of the journal')
+    args = parser.parse_args(argv)
+
+    state = JournalState()
+    started = time.perf_counter()
+    count = 0
+    for path in segments(args.path) if args.all else [args.path]:
+        if args.all and not args.quiet:
+            print(f"-- {path}")
+        for op, timestamp, value in read_journal(path):
+            state.apply(op, value)
+            count += 1
+            if not args.quiet:
+                print(f"{datetime.fromtimestamp(timestamp).isoformat(sep=' ', timespec='milliseconds')}  {describe(op, value)}")
+    elapsed = time.perf_counter() - started
+
+    drawn = [number for kind, number in state.engine.history if kind == 'draw']
+    print(f"Replayed {count} records in {elapsed * 1000:.1f} ms")
+    if state.seeded:
+        print(f"Game: {state.engine.game_number} of session {state.engine.session_seed}")
+    print(f"Mode: {state.mode or '-'}")
+    print(f"Drawn ({len(drawn)}): " + ' '.join(f"{letter_of(n)}{n}" for n in drawn))
+    print(f"Marked on call sheet: {len(state.called)}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+import re
+from functools import lru_cache
+from itertools import combinations, product
+
+# Card cells are numbered row * 5 + col, so (row, col) = (2, 2) is bit 12
+FREE_SPACE = 1 << 12
+FULL_CARD = (1 << 25) - 1
+
+
+def cell(row, col):
+    return 1 << (row * 5 + col)
+
+
+def mask_of(positions):
+    mask = 0
+    for row, col in positions:
+        mask |= cell(row, col)
+    return mask
+
+
+def positions_of(mask):
+    return [(i // 5, i % 5) for i in range(25) if mask >> i & 1]
+
+
+ROWS = [mask_of((row, col) for col in range(5)) for row in range(5)]
+COLUMNS = [mask_of((row, col) for row in range(5)) for col in range(5)]
+DIAGONALS = [mask_of((i, i) for i in range(5)), mask_of((4 - i, i) for i in range(5))]
+LINES = ROWS + COLUMNS + DIAGONALS
+
+
+def union(masks):
+    total = 0
+    for mask in masks:
+        total |= mask
+    return total
+
+
+def any_lines(count):
+    return [union(combo) for combo in combinations(LINES, count)]
+
+
+class Pattern:
+    # A game pattern is won when every cell of any one alternative is marked.
+    # `display` is the mask drawn on the template card and defaults to the
+    # first alternative.
+
+    def __init__(self, name, alternatives, display=None, marks_n_column=False):
+        self.name = name
+        self.alternatives = tuple(dict.fromkeys(alternatives))
+        self.display = self.alternatives[0] if display is None else display
+        self.marks_n_column = marks_n_column
+        # Alternatives that include each cell, so that marking a single cell
+        # only has to test the alternatives it can complete
+        self._by_cell = [tuple(alt for alt in self.alternatives if alt >> i & 1) for i in range(25)]
+
+    def matches(self, marked):
+        for alt in self.alternatives:
+            if marked & alt == alt:
+                return True
+        return False
+
+    def completed_by(self, marked, index):
+        for alt in self._by_cell[index]:
+            if marked & alt == alt:
+                return True
+        return False
+
+
+class CountPattern(Pattern):
+    # Won when any `count` of `masks` are complete. The alternatives are
+    # every combination, as for Pattern, but matching checks each mask once
+    # instead of each combination (12 line checks instead of 220 for any 3
+    # lines).
+
+    def __init__(self, name, masks, count, display=None, marks_n_column=False):
+        super().__init__(name, [union(combo) for combo in combinations(masks, count)], display, marks_n_column)
+        self.masks = tuple(masks)
+        self.count = count
+        self._masks_by_cell = [tuple(mask for mask in self.masks if mask >> i & 1) for i in range(25)]
+
+    def matches(self, marked):
+        complete = 0
+        for mask in self.masks:
+            if marked & mask == mask:
+                complete += 1
+                if complete == self.count:
+                    return True
+        return False
+
+    def completed_by(self, marked, index):
+        # Only a newly completed mask through this cell can make a winner
+        for mask in self._masks_by_cell[index]:
+            if marked & mask == mask:
+                return self.matches(marked)
+        return False
+
+
+def grid_mask(grid):
+    # Five rows of X (in the pattern) and . (not) separated by '/' or newlines
+    rows = grid.replace('/', '\n').split()
+    if len(rows) != 5 or any(len(row) != 5 or set(row.upper()) - set('X.') for row in rows):
+        raise ValueError(f"{grid!r} is not five rows of five X or . characters")
+    mask = mask_of((row, col) for row in range(5) for col in range(5) if rows[row][col].upper() == 'X')
+    if not mask:
+        raise ValueError(f"{grid!r} has no cells in the pattern")
+    return mask
+
+
+def any_of(name, masks, count, display=None, marks_n_column=False):
+    # Pattern won by any `count` of `masks`; a single mask is checked
+    # fastest as a plain list of alternatives
+    if count == 1:
+        return Pattern(name, masks, display, marks_n_column)
+    return CountPattern(name, masks, count, display, marks_n_column)
+
+
+def rotations(mask):
+    # The mask turned 0, 90, 180 and 270 degrees
+    turned = [mask]
+    for _ in range(3):
+        mask = mask_of((col, 4 - row) for row, col in positions_of(mask))
+        turned.append(mask)
+    return turned
+
+
+def _register(*patterns):
+    return {pattern.name: pattern for pattern in patterns}
+
+
+PATTERNS = _register(
+    any_of('Single Bingo', LINES, 1, display=DIAGONALS[0]),
+    any_of('Double Bingo', LINES, 2,
+           display=COLUMNS[0] | ROWS[0]),
+    any_of('Triple Bingo', LINES, 3,
+           display=COLUMNS[0] | COLUMNS[2] | DIAGONALS[0]),
+    Pattern('Letter X', [DIAGONALS[0] | DIAGONALS[1]], marks_n_column=True),
+    Pattern('Corner Picture Frame', [mask_of([(0, 0), (1, 0), (3, 0), (4, 0),  # B Column
+                                              (0, 4), (1, 4), (3, 4), (4, 4),  # O Column
+                                              (0, 1), (4, 1),  # Top and bottom of I Column
+                                              (0, 3), (4, 3)])],  # Top and bottom of G Column
+            marks_n_column=True),
+    Pattern('Check Mark', [mask_of([(4, 0), (3, 1), (2, 2), (1, 3), (0, 4),  # Diagonal
+                                    (2, 0), (3, 0)])]),  # B's 3rd and 4th downs
+    Pattern('Four Corners', [mask_of([(0, 0), (0, 4), (4, 0), (4, 4)])]),
+    Pattern('Heart', [mask_of([(1, 0), (2, 0),  # B's 2nd and 3rd
+                               (0, 1), (3, 1),  # I's 1st and 4th
+                               (1, 2), (4, 2),  # N's 2nd and 5th
+                               (0, 3), (3, 3),  # G's 1st and 4th
+                               (1, 4), (2, 4)])]),  # O's 2nd and 3rd
+    Pattern('Postage Stamp', [mask_of([(0, 0), (0, 1), (1, 0), (1, 1),  # Top-left
+                                       (3, 3), (3, 4), (4, 3), (4, 4)])]),  # Bottom-right
+    Pattern('Block of 8', [mask_of([(1, 1), (2, 1),  # I column
+                                    (1, 2), (2, 2),  # N column
+                                    (1, 3), (2, 3),  # G column
+                                    (1, 4), (2, 4)])]),  # O column
+    Pattern('Blackout', [FULL_CARD]),
+)
+
+
+# Pattern language for custom games, e.g. from Manual Entry:
+#   X...X/.X.X./..X../.X.X./X...X    grid art, rows separated by '/'
+#   B1 B5 O1 O5 N3                   named cells, letter then row; FREE is N3
+#   row 2, column B                  whole rows and columns
+#   any line, any 2 lines, any row, any 3 columns, any diagonal
+#   Four Corners                     any built-in mode by name
+#   A + B                            everything in A and in B
+#   A | B                            either A or B
+#   ... any rotation                 the shape turned to any of 4 positions
+# Commas separate words like spaces do. Text is matched case-insensitively
+# with spaces collapsed, and compiled patterns are cached on that normalized
+# text.
+LINE_GROUPS = {'line': LINES, 'row': ROWS, 'column': COLUMNS, 'diagonal': DIAGONALS}
+MAX_ALTERNATIVES = 5000
+
+_ANY = re.compile(r'any (?:(\d+) )?(line|row|column|diagonal)s?')
+_CELL = re.compile(r'([bingo])([1-5])|free')
+_LINE = re.compile(r'(?:row ([1-5])|col(?:umn)? ([bingo]))')
+_BUILT_IN = {name.lower(): pattern for name, pattern in PATTERNS.items()}
+
+
+def normalize(text):
+    return ' '.join(text.lower().replace(',', ' ').split())
+
+
+def _term(text):
+    # Returns (alternatives, any_of) where any_of is (masks, count) when the
+    # term is an "any N lines" style choice
+    rotate = text.endswith(' any rotation')
+    if rotate:
+        text = text[:-len(' any rotation')].strip()
+    match = _ANY.fullmatch(text)
+    if match:
+        masks = LINE_GROUPS[match.group(2)]
+        count = int(match.group(1) or 1)
+        if not 1 <= count <= len(masks):
+            raise ValueError(f"{text!r}: a card only has {len(masks)} of those")
+        alternatives = [union(combo) for combo in combinations(masks, count)]
+        any_of = (masks, count)
+    elif text in _BUILT_IN:
+        alternatives = list(_BUILT_IN[text].alternatives)
+        any_of = None
+    elif '/' in text:
+        alternatives = [grid_mask(text)]
+        any_of = None
+    else:
+        mask = 0
+        for word in re.findall(r'row [1-5]|col(?:umn)? [bingo]|\S+', text):
+            cell_match = _CELL.fullmatch(word)
+            line_match = _LINE.fullmatch(word)
+            if cell_match:
+                mask |= FREE_SPACE if word == 'free' else cell(int(cell_match.group(2)) - 1, 'bingo'.index(cell_match.group(1)))
+            elif line_match and line_match.group(1):
+                mask |= ROWS[int(line_match.group(1)) - 1]
+            elif line_match:
+                mask |= COLUMNS['bingo'.index(line_match.group(2))]
+            else:
+                raise ValueError(f"{word!r} is not a cell, line, grid or game mode")
+        alternatives = [mask]
+        any_of = None
+    if rotate:
+        alternatives = [turned for mask in alternatives for turned in rotations(mask)]
+        any_of = None
+    return alternatives, any_of
+
+
+@lru_cache(maxsize=256)
+def _compile(text):
+    alternatives = []
+    for choice in text.split('|'):
+        parts = [term.strip() for term in choice.split('+')]
+        if not all(parts):
+            raise ValueError(f"{text!r} has an empty part")
+        terms = [_term(term) for term in parts]
+        if len(terms) == 1 and terms[0][1] is not None and '|' not in text:
+            return any_of(text, *terms[0][1])
+        combos = 1
+        for term_alternatives, _ in terms:
+            combos *= len(term_alternatives)
+        if len(alternatives) + combos > MAX_ALTERNATIVES:
+            raise ValueError(f"{text!r} has more than {MAX_ALTERNATIVES} alternatives")
+        alternatives += [union(combo) for combo in product(*(term_alternatives for term_alternatives, _ in terms))]
+    if any(not mask & ~FREE_SPACE for mask in alternatives):
+        # Every card would win before a single call
+        raise ValueError(f"{text!r} needs a cell other than the free space")
+    # An alternative that contains another one can never be the first to win
+    alternatives = sorted(set(alternatives), key=lambda mask: bin(mask).count('1'))
+    kept = []
+    for mask in alternatives:
+        if not any(mask & smaller == smaller for smaller in kept):
+            kept.append(mask)
+    return Pattern(text, kept)
+
+
+def compile_pattern(text):
+    # Raises ValueError for text that is not a pattern. Text naming a
+    # built-in mode in any case gives the built-in itself, with its display
+    # mask and N column marking.
+    text = normalize(text)
+    if not text:
+        raise ValueError('empty pattern')
+    if text in _BUILT_IN:
+        return _BUILT_IN[text]
+    return _compile(text)
+
+
+def find_pattern(mode):
+    # The built-in mode of that name, or the mode compiled as a pattern, or
+    # None for a mode that is only a label
+    pattern = PATTERNS.get(mode)
+    if pattern is None and mode:
+        try:
+            pattern = compile_pattern(mode)
+        except ValueError:
+            return None
+    return pattern
@@ -0,0 +1,241 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QMarginsF, QRectF, Qt  # noqa: E402
+from PyQt5.QtGui import (QColor, QFont, QGuiApplication, QImage, QPageLayout, QPageSize, QPainter,  # noqa: E402
+                         QPdfWriter, QPen)
+
+from deck import CardGenerator, Deck  # noqa: E402
+from theme import THEMES  # noqa: E402
+
+# Cards are printed in chunks of whole sheets. Each worker process reads its
+# own cards straight from the deck file or the generator and paints one
+# sheet at a time, so memory does not grow with the number of cards.
+
+PAGE_SIZES = {'letter': QPageSize.Letter, 'a4': QPageSize.A4}
+MARGIN_MM = 8
+GAP = 0.06  # space between cards as a fraction of a card's width
+
+_app = None
+
+
+def _gui_app():
+    # Fonts need a QGuiApplication, one per process
+    global _app
+    if QGuiApplication.instance() is None:
+        _app = QGuiApplication(['print_cards'])
+    return QGuiApplication.instance()
+
+
+class CardPainter:
+    # Paints printable cards: a letter header, the 5x5 grid with the free
+    # space, and the card's serial number underneath. Cards are always printed
+    # in the default theme's colours.
+
+    def __init__(self):
+        colors = THEMES['default']
+        self._letter_brushes = colors.letter_brushes
+        self._letter_pens = colors.letter_pens
+        self._free_brush = colors.idle_brush
+        self._border_pen = QPen(QColor('black'))
+        self._text_pen = QPen(QColor('black'))
+        self._header_font = QFont()
+        self._header_font.setBold(True)
+        self._font = QFont()
+        self._free_font = QFont()
+        self._serial_font = QFont()
+        self._size = None
+
+    def _set_cell(self, cell):
+        # Font sizes follow the cell size, recomputed only when it changes
+        if self._size == cell:
+            return
+        self._size = cell
+        self._header_font.setPixelSize(max(6, int(cell * 0.5)))
+        self._font.setPixelSize(max(6, int(cell * 0.38)))
+        self._free_font.setPixelSize(max(5, int(cell * 0.16)))
+        self._serial_font.setPixelSize(max(5, int(cell * 0.2)))
+        self._border_pen.setWidthF(max(1.0, cell * 0.02))
+
+    def paint(self, painter, rect, card, serial):
+        # The card takes 5 cells across and 6.5 down: header, grid and serial
+        cell = min(rect.width() / 5, rect.height() / 6.5)
+        self._set_cell(cell)
+        left = rect.left() + (rect.width() - cell * 5) / 2
+        top = rect.top() + (rect.height() - cell * 6.5) / 2
+
+        painter.setFont(self._header_font)
+        for col in range(5):
+            cell_rect = QRectF(left + col * cell, top, cell, cell)
+            painter.fillRect(cell_rect, self._letter_brushes[col])
+            painter.setPen(self._letter_pens[col])
+            painter.drawText(cell_rect, Qt.AlignCenter, 'BINGO'[col])
+
+        painter.setPen(self._border_pen)
+        painter.setBrush(Qt.NoBrush)
+        painter.setFont(self._font)
+        for index in range(25):
+            cell_rect = QRectF(left + index % 5 * cell, top + (index // 5 + 1) * cell, cell, cell)
+            if index == 12:
+                painter.fillRect(cell_rect, self._free_brush)
+                painter.drawRect(cell_rect)
+                painter.setFont(self._free_font)
+                painter.drawText(cell_rect, Qt.AlignCenter | Qt.TextWordWrap, 'FREE\nSPACE')
+                painter.setFont(self._font)
+            else:
+                painter.drawRect(cell_rect)
+                painter.drawText(cell_rect, Qt.AlignCenter, str(card[index]))
+
+        painter.setFont(self._serial_font)
+        painter.setPen(self._text_pen)
+        painter.drawText(QRectF(left, top + 6 * cell, cell * 5, cell * 0.5), Qt.AlignRight | Qt.AlignVCenter, serial)
+
+
+def sheet_rects(width, height, columns, rows, margin):
+    # Slots for the cards of one sheet in reading order
+    slot_width = (width - 2 * margin) / columns
+    slot_height = (height - 2 * margin) / rows
+    gap = slot_width * GAP / 2
+    return [QRectF(margin + col * slot_width + gap, margin + row * slot_height + gap,
+                   slot_width - 2 * gap, slot_height - 2 * gap)
+            for row in range(rows) for col in range(columns)]
+
+
+_decks = {}
+
+
+def open_cards(source):
+    # source is ('deck', path) or ('seed', seed); returns card(n) and a label
+    # printed with every serial number. Deck files stay mapped for the life
+    # of the worker.
+    kind, value = source
+    if kind == 'deck':
+        deck = _decks.get(value)
+        if deck is None:
+            deck = _decks[value] = Deck(value)
+        return deck.card, f"deck {deck.seed & 0xffffffff:08x}"
+    generator = CardGenerator(value)
+    return generator.card, f"deck {value & 0xffffffff:08x}"
+
+
+def _print_range(source, start, end, out_dir, fmt, layout, page, dpi):
+    # Worker: prints cards start..end-1 and returns the files it wrote
+    _gui_app()
+    card, label = open_cards(source)
+    columns, rows = layout
+    per_sheet = columns * rows
+    painter = QPainter()
+    card_painter = CardPainter()
+    written = []
+
+    if fmt == 'pdf':
+        path = os.path.join(out_dir, f"cards-{start:06d}-{end - 1:06d}.pdf")
+        writer = QPdfWriter(path)
+        writer.setCreator('Stevens Bingo')
+        writer.setResolution(dpi)
+        writer.setPageLayout(QPageLayout(QPageSize(PAGE_SIZES[page]), QPageLayout.Portrait,
+                                         QMarginsF(MARGIN_MM, MARGIN_MM, MARGIN_MM, MARGIN_MM), QPageLayout.Millimeter))
+        painter.begin(writer)
+        rects = sheet_rects(writer.width(), writer.height(), columns, rows, 0)
+        for first in range(start, end, per_sheet):
+            if first != start:
+                writer.newPage()
+            for rect, number in zip(rects, range(first, min(first + per_sheet, end))):
+                card_painter.paint(painter, rect, card(number), f"#{number:06d}  {label}")
+        painter.end()
+        written.append(path)
+    else:
+        page_size = QPageSize(PAGE_SIZES[page]).sizePixels(dpi)
+        image = QImage(page_size.width(), page_size.height(), QImage.Format_RGB32)
+        rects = sheet_rects(image.width(), image.height(), columns, rows, MARGIN_MM / 25.4 * dpi)
+        for first in range(start, end, per_sheet):
+            last = min(first + per_sheet, end) - 1
+            image.fill(Qt.white)
+            painter.begin(image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            for rect, number in zip(rects, range(first, last + 1)):
+                card_painter.paint(painter, rect, card(number), f"#{number:06d}  {label}")
+            painter.end()
+            path = os.path.join(out_dir, f"cards-{first:06d}-{last:06d}.png")
+            image.save(path)
+            written.append(path)
+    return written
+
+
+def print_cards(source, first, count, out_dir, fmt='pdf', layout=(2, 2), page='letter', dpi=300,
+                per_file=400, workers=1):
+    # Splits the cards into chunks of whole sheets and prints them in a process
+    # pool, yielding the files as they are finished
+    per_sheet = layout[0] * layout[1]
+    per_file = max(per_sheet, per_file // per_sheet * per_sheet)
+    starts = range(first, first + count, per_file)
+    ends = [min(start + per_file, first + count) for start in starts]
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(source, start, end, out_dir, fmt, layout, page, dpi) for start, end in zip(starts, ends)]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            for written in pool.map(_print_range, *zip(*jobs)):
+                yield from written
+    else:
+        for job in jobs:
+            yield from _print_range(*job)
+
+
+def parse_layout(text):
+    columns, _, rows = text.lower().partition('x')
+    try:
+        layout = int(columns), int(rows)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"layout must look like 2x2, not {text!r}")
+    if min(layout) < 1:
+        raise argparse.ArgumentTypeError('layout needs at least one card')
+    return layout
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Print cards from a deck file or deck seed to PDF or PNG sheets.')
+    parser.add_argument('deck', nargs='?', help='deck file to print from')
+    parser.add_argument('--seed', type=int, help='print from the generator with this seed instead of a deck file')
+    parser.add_argument('--first', type=int, default=1, help='first card number to print')
+    parser.add_argument('--count', type=int, help='number of cards (default: the rest of the deck)')
+    parser.add_argument('-o', '--output', default='cards', help='directory for the sheets')
+    parser.add_argument('--format', choices=('pdf', 'png'), default='pdf')
+    parser.add_argument('--layout', type=parse_layout, default=(2, 2), help='cards across x down per sheet')
+    parser.add_argument('--page', choices=sorted(PAGE_SIZES), default='letter')
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--per-file', type=int, default=400, help='cards per PDF file and per worker job')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    if (args.deck is None) == (args.seed is None):
+        parser.error('pass either a deck file or --seed')
+    if args.deck is not None:
+        with Deck(args.deck) as deck:
+            available = len(deck) - args.first + 1
+        source = ('deck', args.deck)
+        count = available if args.count is None else min(args.count, available)
+    else:
+        if args.count is None:
+            parser.error('--seed needs --count')
+        source = ('seed', args.seed)
+        count = args.count
+    if count < 1 or args.first < 1:
+        parser.error('nothing to print')
+
+    started = time.perf_counter()
+    files = 0
+    for path in print_cards(source, args.first, count, args.output, args.format, args.layout, args.page,
+                            args.dpi, args.per_file, args.workers):
+        files += 1
+        print(path)
+    print(f"Printed {count} cards to {files} files in {time.perf_counter() - started:.1f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from patterns import PATTERNS, compile_pattern, positions_of
+
+# Offset of the first ball of each letter, shaped to broadcast over (games, 5, 15)
+LETTER_OFFSETS = (1 + 15 * np.arange(5)).reshape(1, 5, 1)
+
+
+def draw_orders(rng, games):
+    # Call order of every ball for a batch of games, using the same rule as
+    # BingoEngine: pick a letter with balls left, then a ball of that letter
+    balls = (np.argsort(rng.random((games, 5, 15)), axis=2) + LETTER_OFFSETS).astype(np.int8)
+    drawn = np.zeros((games, 5), dtype=np.int64)
+    orders = np.empty((games, 75), dtype=np.int8)
+    rows = np.arange(games)
+    for step in range(75):
+        keys = np.where(drawn < 15, rng.random((games, 5)), -1.0)
+        letters = keys.argmax(axis=1)
+        orders[:, step] = balls[rows, letters, drawn[rows, letters]]
+        drawn[rows, letters] += 1
+    return orders
+
+
+def call_times(orders):
+    # times[g, n] is the 0-based call at which ball n came out in game g, with
+    # the free space (number 0) counted as already marked
+    games = len(orders)
+    times = np.empty((games, 76), dtype=np.int8)
+    times[:, 0] = -1
+    times[np.arange(games)[:, None], orders.astype(np.int64)] = np.arange(75, dtype=np.int8)
+    return times
+
+
+def random_cards(rng, count):
+    # (count, 25) cards in row order with 0 as the free space
+    columns = np.argsort(rng.random((count, 5, 15)), axis=2)[:, :, :5] + LETTER_OFFSETS
+    cards = columns.transpose(0, 2, 1).reshape(count, 25)
+    cards[:, 12] = 0
+    return cards
+
+
+def _simulate_chunk(alternatives, games, cards, seed, batch_cells=1 << 23):
+    rng = np.random.default_rng(seed)
+    cells = [np.array([row * 5 + col for row, col in positions_of(mask)]) for mask in alternatives]
+    calls_hist = np.zeros(76, dtype=np.int64)
+    winners_hist = np.zeros(cards + 1, dtype=np.int64)
+    batch = max(1, batch_cells // (cards * 25))
+    for start in range(0, games, batch):
+        size = min(batch, games - start)
+        card_numbers = random_cards(rng, cards)
+        times = call_times(draw_orders(rng, size))[:, card_numbers]  # (games, cards, 25)
+        won_at = np.full((size, cards), 127, dtype=np.int8)
+        for alt in cells:
+            np.minimum(won_at, times[:, :, alt].max(axis=2), out=won_at)
+        first = won_at.min(axis=1)
+        calls_hist += np.bincount(first.astype(np.int64) + 1, minlength=76)
+        winners_hist += np.bincount((won_at == first[:, None]).sum(axis=1), minlength=cards + 1)
+    return calls_hist, winners_hist
+
+
+def simulate(pattern, games, cards, workers=1, seed=None, chunk=2000):
+    # Histograms of the calls needed for the first winner (index = calls) and
+    # of the number of cards sharing that first win
+    seeds = np.random.SeedSequence(seed).spawn((games + chunk - 1) // chunk)
+    sizes = [min(chunk, games - start) for start in range(0, games, chunk)]
+    args = ([pattern.alternatives] * len(sizes), sizes, [cards] * len(sizes), seeds)
+    calls_hist = np.zeros(76, dtype=np.int64)
+    winners_hist = np.zeros(cards + 1, dtype=np.int64)
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_simulate_chunk, *args))
+    else:
+        results = [_simulate_chunk(*chunk_args) for chunk_args in zip(*args)]
+    for chunk_calls, chunk_winners in results:
+        calls_hist += chunk_calls
+        winners_hist += chunk_winners
+    return calls_hist, winners_hist
+
+
+def summarize(name, calls_hist, winners_hist):
+    games = int(calls_hist.sum())
+    calls = np.arange(len(calls_hist))
+    cumulative = np.cumsum(calls_hist) / games
+    winners = np.arange(len(winners_hist))
+    return {
+        'mode': name,
+        'games': games,
+        'mean_calls': float((calls * calls_hist).sum() / games),
+        'p10_calls': int(np.searchsorted(cumulative, 0.1)),
+        'median_calls': int(np.searchsorted(cumulative, 0.5)),
+        'p90_calls': int(np.searchsorted(cumulative, 0.9)),
+        'mean_winners': float((winners * winners_hist).sum() / games),
+        'split_probability': float(winners_hist[2:].sum() / games),
+        'calls_histogram': calls_hist.tolist(),
+        'winners_histogram': np.trim_zeros(winners_hist, 'b').tolist(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Monte Carlo odds for each game mode.')
+    parser.add_argument('--games', type=int, default=10000, help='games simulated per mode')
+    parser.add_argument('--cards', type=int, default=100, help='cards in play per game')
+    parser.add_argument('--mode', action='append', choices=list(PATTERNS), help='mode to simulate (default all)')
+    parser.add_argument('--custom', action='append', default=[], metavar='PATTERN',
+                        help="custom pattern, e.g. 'X...X/.X.X./..X../.X.X./X...X' or 'any 2 lines | B1 B5 O1 O5'")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--json', metavar='PATH', help='write full results to this file')
+    args = parser.parse_args(argv)
+
+    patterns = [PATTERNS[mode] for mode in args.mode or PATTERNS]
+    try:
+        patterns += [compile_pattern(text) for text in args.custom]
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    results = []
+    print(f"{'Mode':<22}{'mean':>7}{'p10':>5}{'p50':>5}{'p90':>5}{'winners':>9}{'split':>7}")
+    for pattern in patterns:
+        started = time.perf_counter()
+        summary = summarize(pattern.name, *simulate(pattern, args.games, args.cards, args.workers, args.seed))
+        summary['seconds'] = time.perf_counter() - started
+        results.append(summary)
+        print(f"{pattern.name:<22}{summary['mean_calls']:>7.2f}{summary['p10_calls']:>5}{summary['median_calls']:>5}"
+              f"{summary['p90_calls']:>5}{summary['mean_winners']:>9.2f}{summary['split_probability']:>7.1%}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'games': args.games, 'cards': args.cards, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+
+from broadcast import BoardSnapshot, BroadcastServer, subscribe
+from headless import HeadlessGame
+
+# Loopback tests: a real BroadcastServer on 127.0.0.1 and subscribe() as the
+# remote display.
+
+
+async def _read(messages, count):
+    return [await asyncio.wait_for(messages.__anext__(), 5) for _ in range(count)]
+
+
+class BroadcastTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = BroadcastServer(host='127.0.0.1', port=0, queue_size=4).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_client(self, client):
+        return asyncio.run(client(subscribe('127.0.0.1', self.server.port)))
+
+    def test_late_joiner_gets_snapshot(self):
+        self.server.draw(17, 52)
+        self.server.select({40}, set(), 52)
+        self.server.mode('Blackout')
+
+        async def client(messages):
+            return (await _read(messages, 1))[0]
+
+        # The loop thread applies each publish before it serves a new client
+        snapshot = self.run_client(client)
+        self.assertEqual(snapshot, {'type': 'snapshot', 'called': [17, 40], 'recent': [17],
+                                    'mode': 'Blackout', 'up_next': 52})
+
+    def test_deltas_follow_snapshot(self):
+        async def client(messages):
+            received = await _read(messages, 1)
+            self.server.draw(17, 52)
+            self.server.select({52}, set(), 3)
+            self.server.reset()
+            return received + await _read(messages, 3)
+
+        received = self.run_client(client)
+        self.assertEqual([message['type'] for message in received], ['snapshot', 'draw', 'select', 'reset'])
+        self.assertEqual(received[1], {'type': 'draw', 'ball': 17, 'up_next': 52})
+        self.assertEqual(received[2], {'type': 'select', 'called': [52], 'uncalled': [], 'up_next': 3})
+
+    def test_slow_client_is_resynced(self):
+        # Far more deltas than the client's queue holds: the client gets a
+        # fresh snapshot and still ends up with the server's board
+        def burst():
+            for index in range(500):
+                self.server.draw(index % 75 + 1, None)
+            self.server.mode('done')
+
+        async def client(messages):
+            board = BoardSnapshot()
+            received = []
+            while board.mode != 'done':
+                message, = await _read(messages, 1)
+                if message['type'] == 'snapshot':
+                    board.called, board.recent = set(message['called']), message['recent']
+                    board.mode, board.up_next = message['mode'], message['up_next']
+                else:
+                    board.apply(message)
+                received.append(message)
+                if len(received) == 1:
+                    burst()
+            return received, board
+
+        received, board = self.run_client(client)
+        self.assertIn('snapshot', [message['type'] for message in received[1:]])
+        self.assertLess(len(received), 502)
+        self.assertEqual(board.message(), self.server.snapshot.message())
+        self.assertEqual(board.called, set(range(1, 76)))
+
+    def test_draw_is_published_once(self):
+        game = HeadlessGame(broadcast=self.server, session_seed=1)
+
+        async def client(messages):
+            received = await _read(messages, 1)
+            ball = game.draw()
+            game.select({75 if ball != 75 else 74})
+            return ball, received + await _read(messages, 2)
+
+        ball, (_, draw, select) = self.run_client(client)
+        self.assertEqual(draw, {'type': 'draw', 'ball': ball, 'up_next': game.engine.peek()})
+        self.assertEqual(select['type'], 'select')
+        self.assertNotIn(ball, select['called'])
+
+    def test_manual_mark_of_up_next_is_published(self):
+        game = HeadlessGame(broadcast=self.server, session_seed=1)
+        game.draw()
+        up_next = game.engine.peek()
+
+        async def client(messages):
+            received = await _read(messages, 1)
+            game.select({up_next})
+            return received + await _read(messages, 1)
+
+        snapshot, select = self.run_client(client)
+        self.assertEqual(snapshot['up_next'], up_next)
+        self.assertEqual(select['called'], [up_next])
+        self.assertEqual(select['up_next'], game.engine.peek())
+        self.assertNotEqual(select['up_next'], up_next)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from cards import CardPool, check_card, load_cards
+from deck import random_card
+from host import CardWorkers, SharedCardPool
+from patterns import FREE_SPACE, PATTERNS, compile_pattern
+
+MODES = [PATTERNS['Single Bingo'], PATTERNS['Double Bingo'], PATTERNS['Four Corners'], PATTERNS['Letter X'],
+         PATTERNS['Blackout'], compile_pattern('any 2 columns | B1 O5')]
+
+
+def marked_cells(card, called):
+    mask = FREE_SPACE
+    for i, number in enumerate(card):
+        if number in called:
+            mask |= 1 << i
+    return mask
+
+
+def brute_force_winners(cards, called, pattern):
+    if pattern is None:
+        return set()
+    return {n for n, card in enumerate(cards, 1) if pattern.matches(marked_cells(card, called))}
+
+
+def play(pool, cards, rng, steps=400, called=()):
+    # Random calls, uncalls, pattern changes and resets, checking the pool's
+    # winners and claims against every card after each one
+    called = set(called)
+    pattern = pool.pattern
+    checked = []
+    for _ in range(steps):
+        action = rng.random()
+        if action < 0.55:
+            numbers = rng.sample(range(1, 76), rng.randint(1, 4))
+            pool.call_many(numbers)
+            called.update(numbers)
+        elif action < 0.8 and called:
+            numbers = rng.sample(sorted(called), min(len(called), rng.randint(1, 3)))
+            pool.uncall_many(numbers)
+            called.difference_update(numbers)
+        elif action < 0.95:
+            pattern = rng.choice(MODES + [None])
+            pool.set_pattern(pattern)
+        else:
+            pool.reset_calls()
+            called = set()
+        winners = brute_force_winners(cards, called, pattern)
+        checked.append((set(pool.winners), winners))
+        claim = rng.randint(1, len(cards))
+        checked.append((pool.verify(claim), claim in winners))
+    return checked
+
+
+class CardPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(5)
+        self.cards = [random_card(rng) for _ in range(300)]
+
+    def test_against_brute_force(self):
+        pool = CardPool(self.cards, PATTERNS['Single Bingo'])
+        for got, expected in play(pool, self.cards, random.Random(6)):
+            self.assertEqual(got, expected)
+
+    def test_winners_record_the_winning_call(self):
+        card = self.cards[0]
+        pool = CardPool([card], PATTERNS['Single Bingo'])
+        top_row = card[:5]
+        self.assertEqual(pool.call_many([75 if 75 not in card else 74]), [])
+        for number in top_row[:-1]:
+            self.assertEqual(pool.call(number), [])
+        self.assertEqual(pool.call(top_row[-1]), [1])
+        self.assertEqual(pool.winners, {1: 6})
+        self.assertEqual(pool.call(top_row[-1]), [])  # already called
+        pool.uncall(top_row[0])
+        self.assertEqual(pool.winners, {})
+
+    def test_cards_added_after_calls(self):
+        pool = CardPool(pattern=PATTERNS['Four Corners'])
+        card = self.cards[1]
+        pool.call_many(card[i] for i in (0, 4, 20, 24))
+        self.assertEqual(pool.add(card), 1)
+        self.assertEqual(pool.winners, {1: 4})
+        self.assertTrue(pool.verify(1))
+
+    def test_verify_unknown_card(self):
+        pool = CardPool(self.cards[:3])
+        with self.assertRaises(IndexError):
+            pool.verify(4)
+        with self.assertRaises(IndexError):
+            pool.verify(0)
+        self.assertFalse(pool.verify(1))  # no pattern
+
+    def test_invalid_card(self):
+        card = list(self.cards[0])
+        card[0] = 16  # an I number in the B column
+        with self.assertRaises(ValueError):
+            check_card(card, 1)
+        with self.assertRaises(ValueError):
+            CardPool([card])
+
+
+class LoadCardsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, text):
+        path = os.path.join(self.directory, 'cards.txt')
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_text_cards(self):
+        card = random_card(random.Random(1))
+        with_free = ' '.join(map(str, card))
+        without_free = ','.join(str(number) for i, number in enumerate(card) if i != 12)
+        self.assertEqual(list(load_cards(self.write(f"{with_free}\n\n{without_free}\n"))), [card, card])
+
+    def test_wrong_count(self):
+        with self.assertRaisesRegex(ValueError, ':2:'):
+            list(load_cards(self.write("1 " * 25 + "\n" + "1 " * 23)))
+
+
+class SharedCardPoolTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.workers = CardWorkers(3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.workers.close()
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.cards = [random_card(rng) for _ in range(200)]
+
+    def test_same_results_as_card_pool(self):
+        shared = SharedCardPool(self.workers, pattern=PATTERNS['Single Bingo'])
+        shared.BATCH = 64  # send cards in several batches
+        local = CardPool(pattern=PATTERNS['Single Bingo'])
+        for card in self.cards[:100]:
+            self.assertEqual(shared.add(card), local.add(card))
+        shared.call_many([5, 20, 33])
+        local.call_many([5, 20, 33])
+        for card in self.cards[100:]:
+            shared.add(card)
+            local.add(card)
+        self.assertEqual(len(shared), len(local))
+
+        shared_checks = play(shared, self.cards, random.Random(8), 150, {5, 20, 33})
+        local_checks = play(local, self.cards, random.Random(8), 150, {5, 20, 33})
+        self.assertEqual(shared_checks, local_checks)
+        for got, expected in shared_checks:
+            self.assertEqual(got, expected)
+        self.assertEqual(shared.winners, local.winners)
+
+    def test_empty_pool(self):
+        pool = SharedCardPool(self.workers, pattern=PATTERNS['Blackout'])
+        self.assertEqual(pool.call_many(range(1, 76)), [])
+        pool.set_pattern(PATTERNS['Four Corners'])
+        pool.reset_calls()
+        self.assertEqual((len(pool), pool.winners, pool.error), (0, {}, None))
+        with self.assertRaises(IndexError):
+            pool.verify(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
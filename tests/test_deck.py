@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from cards import check_card, load_cards
+from deck import (CARD_SPACE, HEADER, RECORD_SIZE, CardGenerator, Deck, card_from_index, pack_card, unpack_card,
+                  write_deck)
+
+
+class CardGeneratorTest(unittest.TestCase):
+
+    def test_cards_are_unique_and_valid(self):
+        generator = CardGenerator(42)
+        cards = [generator.card(n) for n in range(1, 5001)]
+        self.assertEqual(len(set(cards)), len(cards))
+        for n, card in enumerate(cards, 1):
+            check_card(card, n)
+            self.assertEqual(card[12], 0)
+
+    def test_cards_depend_only_on_seed_and_number(self):
+        self.assertEqual(CardGenerator(42).card(1000), CardGenerator(42).card(1000))
+        self.assertNotEqual([CardGenerator(42).card(n) for n in range(1, 11)],
+                            [CardGenerator(43).card(n) for n in range(1, 11)])
+
+    def test_indexes_stay_in_the_card_space(self):
+        generator = CardGenerator(7)
+        for n in (1, 2, CARD_SPACE // 2, CARD_SPACE):
+            self.assertTrue(0 <= generator.index(n) < CARD_SPACE)
+        for n in (0, CARD_SPACE + 1):
+            with self.assertRaises(IndexError):
+                generator.index(n)
+
+    def test_card_from_index(self):
+        first, last = card_from_index(0), card_from_index(CARD_SPACE - 1)
+        self.assertNotEqual(first, last)
+        for card in (first, last, card_from_index(123456789)):
+            check_card(card, 1)
+            for col in range(5):
+                column = [card[row * 5 + col] for row in range(5) if (row, col) != (2, 2)]
+                self.assertEqual(len(set(column)), len(column))
+
+    def test_pack_round_trip(self):
+        card = CardGenerator(1).card(1)
+        self.assertEqual(len(pack_card(card)), RECORD_SIZE)
+        self.assertEqual(unpack_card(pack_card(card)), card)
+
+
+class DeckTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'night.deck')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        write_deck(self.path, 1000, seed=9, chunk=300)
+        generator = CardGenerator(9)
+        with Deck(self.path) as deck:
+            self.assertEqual((len(deck), deck.seed), (1000, 9))
+            self.assertEqual(list(deck), [generator.card(n) for n in range(1, 1001)])
+            self.assertEqual(deck.card(1000), generator.card(1000))
+            self.assertEqual(deck.record(1), pack_card(generator.card(1)))
+            for n in (0, 1001):
+                with self.assertRaises(IndexError):
+                    deck.card(n)
+        self.assertEqual(list(load_cards(self.path))[:3], [generator.card(n) for n in (1, 2, 3)])
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_workers_write_the_same_deck(self):
+        write_deck(self.path, 500, seed=9, chunk=100)
+        other = os.path.join(self.directory, 'parallel.deck')
+        write_deck(other, 500, seed=9, chunk=100, workers=2)
+        with open(self.path, 'rb') as a, open(other, 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_truncated_deck(self):
+        write_deck(self.path, 10, seed=9)
+        os.truncate(self.path, HEADER.size + 9 * RECORD_SIZE + 5)
+        with self.assertRaisesRegex(ValueError, 'truncated'):
+            Deck(self.path)
+        os.truncate(self.path, HEADER.size - 1)
+        with self.assertRaisesRegex(ValueError, 'not a deck'):
+            Deck(self.path)
+
+    def test_not_a_deck(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'x' * 100)
+        with self.assertRaisesRegex(ValueError, 'not a version'):
+            Deck(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import random
+import unittest
+
+from engine import BingoEngine, call_at, day_sequences, draw_sequence, game_seed
+
+
+class EngineTest(unittest.TestCase):
+
+    def test_draws_follow_the_game_sequence(self):
+        engine = BingoEngine(7)
+        drawn = []
+        while True:
+            ball = engine.peek()
+            self.assertEqual(engine.draw(), ball)
+            if ball is None:
+                break
+            drawn.append(ball)
+        self.assertEqual(bytes(drawn), draw_sequence(game_seed(7, 1)))
+        self.assertEqual(sorted(drawn), list(range(1, 76)))
+        self.assertEqual(engine.remaining(), 0)
+        self.assertEqual(engine.recent(3), drawn[:-4:-1])
+
+    def test_marked_balls_are_skipped(self):
+        engine = BingoEngine(7)
+        sequence = engine.sequence
+        self.assertTrue(engine.mark(sequence[0]))
+        self.assertFalse(engine.mark(sequence[0]))
+        self.assertEqual(engine.mark_many([sequence[0], sequence[2], sequence[3]]), [sequence[2], sequence[3]])
+        self.assertEqual(engine.peek(), sequence[1])
+        self.assertEqual(engine.draw(), sequence[1])
+        self.assertEqual(engine.draw(), sequence[4])
+        self.assertEqual(engine.recent(5), [sequence[4], sequence[1]])
+
+    def test_undo_puts_a_ball_back_in_its_place(self):
+        engine = BingoEngine(7)
+        sequence = engine.sequence
+        first, second = engine.draw(), engine.draw()
+        engine.mark(sequence[5])
+        self.assertEqual(engine.undo(), sequence[5])
+        self.assertEqual(engine.undo(), second)
+        self.assertFalse(engine.is_called(second))
+        self.assertEqual(engine.peek(), second)
+        self.assertEqual(engine.undo(), first)
+        self.assertEqual(engine.draw(), sequence[0])
+        self.assertIsNone(BingoEngine(7).undo())
+
+    def test_against_a_list_of_remaining_balls(self):
+        # Random draws, marks and undos compared with the plain model: the
+        # next ball is the first of the sequence that is not called
+        rng = random.Random(11)
+        engine = BingoEngine(3)
+        called, history = set(), []
+        for _ in range(3000):
+            action = rng.random()
+            if action < 0.4:
+                ball = engine.draw()
+                expected = next((ball for ball in engine.sequence if ball not in called), None)
+                self.assertEqual(ball, expected)
+                if ball is not None:
+                    called.add(ball)
+                    history.append(ball)
+            elif action < 0.7:
+                numbers = rng.sample(range(1, 76), rng.randint(1, 3))
+                marked = engine.mark_many(numbers)
+                self.assertEqual(marked, [number for number in numbers if number not in called])
+                called.update(marked)
+                history += marked
+            elif action < 0.95:
+                self.assertEqual(engine.undo(), history.pop() if history else None)
+                called = set(history)
+            else:
+                engine.reset()
+                called, history = set(), []
+            self.assertEqual(engine.remaining(), 75 - len(called))
+            self.assertEqual(engine.peek(), next((ball for ball in engine.sequence if ball not in called), None))
+
+    def test_replay_draw(self):
+        engine = BingoEngine(7)
+        sequence = engine.sequence
+        engine.replay_draw(sequence[0])
+        engine.replay_draw(sequence[10])  # out of turn
+        self.assertEqual(engine.recent(2), [sequence[10], sequence[0]])
+        self.assertEqual(engine.draw(), sequence[1])
+        with self.assertRaises(ValueError):
+            engine.replay_draw(sequence[10])
+
+    def test_reset_starts_the_next_game(self):
+        engine = BingoEngine(7)
+        self.assertEqual(engine.game_number, 1)
+        engine.reset()
+        self.assertEqual(engine.game_number, 1)  # nothing was called
+        engine.draw()
+        engine.reset()
+        self.assertEqual(engine.game_number, 2)
+        self.assertEqual(engine.sequence, draw_sequence(game_seed(7, 2)))
+        self.assertEqual(engine.recent(1), [])
+        engine.start_session(9, 4)
+        self.assertEqual(engine.draw(), draw_sequence(game_seed(9, 4))[0])
+
+    def test_session_sequences_are_reproducible(self):
+        games = day_sequences(12345, 5)
+        self.assertEqual(games, day_sequences(12345, 5))
+        self.assertEqual(len(set(games)), 5)
+        self.assertNotEqual(games, day_sequences(12346, 5))
+        self.assertEqual(BingoEngine(12345).sequence, games[0])
+        for number, sequence in enumerate(games, 1):
+            self.assertEqual(sorted(sequence), list(range(1, 76)))
+            for call in (1, 38, 75):
+                self.assertEqual(call_at(12345, number, call), sequence[call - 1])
+        engine = BingoEngine(12345)
+        engine.start_session(12345, 3)
+        self.assertEqual(engine.ball_at(1), games[2][0])
+
+    def test_seed_covers_the_whole_64_bit_range(self):
+        self.assertEqual(len(draw_sequence(game_seed((1 << 64) - 1, 1))), 75)
+
+
+if __name__ == '__main__':
+    unittest.main()
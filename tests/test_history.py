@@ -0,0 +1,74 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from history import HistoryStore, average_calls_to_win
+
+
+class HistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'history.sqlite3')
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.directory)
+
+    def store(self):
+        store = HistoryStore(self.path, batch_interval=0.01)
+        self.stores.append(store)
+        return store
+
+    def rows(self, sql):
+        db = sqlite3.connect(self.path)
+        try:
+            return db.execute(sql).fetchall()
+        finally:
+            db.close()
+
+    def test_two_processes_sharing_a_database(self):
+        # Two stores on one file, as with one app per room
+        a, b = self.store().room('A'), self.store().room('B')
+        a.start_game(1, 1, 'Blackout')
+        b.start_game(2, 1, 'Blackout')
+        a.call(5, 1)
+        b.call(70, 1)
+        b.call(71, 2)
+        b.claim(12, 2, True)
+        for store in self.stores:
+            store.flush()
+
+        calls = self.rows('SELECT room, number FROM calls JOIN games ON games.id = game_id ORDER BY number')
+        self.assertEqual(calls, [('A', 5), ('B', 70), ('B', 71)])
+        self.assertEqual(average_calls_to_win(self.path, 'Blackout', room='B'), (2.0, 1))
+        self.assertEqual(average_calls_to_win(self.path, 'Blackout', room='A'), (None, 0))
+
+    def test_resume_carries_on_with_the_latest_game(self):
+        store = self.store()
+        game_id = store.room('A').start_game(1, 1, 'Blackout')
+        store.close()
+
+        resumed = self.store().room('A')
+        self.assertEqual(resumed.start_game(1, 1, 'Letter X', resume=True), game_id)
+        self.assertNotEqual(self.store().room('B').start_game(1, 1, resume=True), game_id)
+
+    def test_failed_write_keeps_the_writer_running(self):
+        store = self.store()
+        history = store.room()
+        history.start_game(1, 1)
+        store.write('INSERT INTO no_such_table VALUES (?)', (1,))
+        history.call(5, 1)
+        with self.assertLogs('history', 'ERROR'):
+            store.flush()
+        history.call(6, 2)
+        store.flush()
+        self.assertEqual(self.rows('SELECT number FROM calls ORDER BY number'), [(5,), (6,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
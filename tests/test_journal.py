@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from journal import DRAW, GAME, MAGIC, RESET, SEGMENT, Journal, read_journal, replay, segments
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'bingo.journal')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_game(self):
+        journal = Journal(self.path)
+        journal.game(7, 1)
+        journal.draw(17, 52)
+        journal.draw(52, 3)
+        journal.close()
+
+    def cut(self, count):
+        # What a crash part way through the last write leaves behind
+        size = os.path.getsize(self.path)
+        os.truncate(self.path, size - count)
+
+    def ops(self):
+        return [op for op, _, _ in read_journal(self.path)]
+
+    def test_round_trip(self):
+        self.write_game()
+        state = replay(self.path)
+        self.assertEqual(self.ops(), [GAME, DRAW, DRAW])
+        self.assertEqual(state.called, {17, 52})
+        self.assertEqual(state.engine.session_seed, 7)
+        self.assertEqual(state.end, os.path.getsize(self.path))
+
+    def test_torn_tail_is_dropped(self):
+        self.write_game()
+        self.cut(1)
+        state = replay(self.path)
+        self.assertEqual(self.ops(), [GAME, DRAW])
+        self.assertEqual(state.called, {17})
+        self.assertLess(state.end, os.path.getsize(self.path))
+
+    def test_append_after_recovery(self):
+        self.write_game()
+        self.cut(1)
+        for ball in (3, 40):
+            # Every restart appends to what the last one left
+            state = replay(self.path)
+            journal = Journal(self.path, state=state)
+            journal.draw(ball, 0)
+            journal.close()
+        self.assertEqual(self.ops(), [GAME, DRAW, DRAW, DRAW])
+        self.assertEqual(replay(self.path).called, {17, 3, 40})
+
+    def test_journal_replays_when_not_given_state(self):
+        self.write_game()
+        self.cut(1)
+        journal = Journal(self.path)
+        journal.draw(3, 0)
+        journal.close()
+        self.assertEqual(replay(self.path).called, {17, 3})
+
+    def test_torn_magic_starts_over(self):
+        with open(self.path, 'wb') as f:
+            f.write(MAGIC[:2])
+        self.assertEqual(replay(self.path).end, 0)
+        journal = Journal(self.path)
+        journal.draw(3, 0)
+        journal.close()
+        self.assertEqual(self.ops(), [DRAW])
+
+    def test_not_a_journal(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'hello world')
+        with self.assertRaises(ValueError):
+            replay(self.path)
+
+    def test_reset_starts_a_segment(self):
+        journal = Journal(self.path)
+        journal.game(7, 1)
+        journal.mode('Blackout')
+        journal.draw(17, 52)
+        journal.reset()
+        journal.game(7, 2)
+        journal.close()
+
+        archived, current = segments(self.path)
+        self.assertEqual([op for op, _, _ in read_journal(archived)][-1], RESET)
+        self.assertEqual(self.ops(), [SEGMENT])
+        state = replay(self.path)
+        self.assertEqual((state.engine.game_number, state.mode, state.called), (2, 'Blackout', set()))
+
+    def test_finish_rotation(self):
+        # A crash after the old segment was archived but before the new one
+        # was renamed into place
+        self.write_game()
+        os.replace(self.path, self.path + '.new')
+        state = replay(self.path)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + '.new'))
+        self.assertEqual(state.called, {17, 52})
+
+    def test_unfinished_new_segment_is_ignored(self):
+        # A crash while the new segment was still being written
+        self.write_game()
+        with open(self.path + '.new', 'wb') as f:
+            f.write(MAGIC)
+        self.assertEqual(replay(self.path).called, {17, 52})
+        self.assertEqual(segments(self.path), [self.path])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+
+from patterns import (COLUMNS, DIAGONALS, FREE_SPACE, LINES, MAX_ALTERNATIVES, PATTERNS, ROWS, CountPattern,
+                      compile_pattern, find_pattern, mask_of, rotations)
+
+CORNERS = mask_of([(0, 0), (0, 4), (4, 0), (4, 4)])
+
+# (text, alternatives the compiled pattern is won by)
+COMPILED = [
+    ('X...X/...../...../...../X...X', [CORNERS]),
+    ('x...x / ..... / ..... / ..... / x...x', [CORNERS]),
+    ('B1 B5 O1 O5', [CORNERS]),
+    ('b1, b5, o1, o5', [CORNERS]),
+    ('N3 B1', [FREE_SPACE | mask_of([(0, 0)])]),
+    ('free B1', [FREE_SPACE | mask_of([(0, 0)])]),
+    ('row 1', [ROWS[0]]),
+    ('col N', [COLUMNS[2]]),
+    ('column o', [COLUMNS[4]]),
+    ('row 2, column B', [ROWS[1] | COLUMNS[0]]),
+    ('row 2 column b', [ROWS[1] | COLUMNS[0]]),
+    ('any diagonal', DIAGONALS),
+    ('any line', LINES),
+    ('any row', ROWS),
+    ('row 1 + column b', [ROWS[0] | COLUMNS[0]]),
+    ('row 1 + any diagonal', [ROWS[0] | DIAGONALS[0], ROWS[0] | DIAGONALS[1]]),
+    ('row 1 | row 5', [ROWS[0], ROWS[4]]),
+    ('four corners | row 1', [CORNERS, ROWS[0]]),
+    # An alternative containing another can never win first
+    ('row 1 | row 1 + row 2', [ROWS[0]]),
+    ('B1 I1 any rotation', rotations(mask_of([(0, 0), (0, 1)]))),
+]
+
+# (text, count, number of masks) for the "any N" choices
+COUNTED = [
+    ('any 2 lines', 2, 12),
+    ('Any 3 Columns', 3, 5),
+    ('any 2 diagonals', 2, 2),
+]
+
+BUILT_IN = [
+    ('Blackout', 'Blackout'),
+    ('BLACKOUT', 'Blackout'),
+    ('  letter   x ', 'Letter X'),
+    ('four corners', 'Four Corners'),
+    ('Single bingo', 'Single Bingo'),
+]
+
+INVALID = [
+    '',
+    '   ',
+    'hello',
+    ',',
+    'row 6',
+    'column z',
+    'any 13 lines',
+    'any 0 rows',
+    'X.X/...',
+    'XXXXX/XXXXX/XXXXX/XXXXX',
+    '...../...../...../...../.....',
+    'row 1 +',
+    '+ row 1',
+    'row 1 | | row 2',
+    # Only the free space: every card would win before a call
+    'free',
+    'N3',
+    '...../...../..X../...../.....',
+    'free | row 1',
+    'N3 any rotation',
+]
+
+
+class PatternLanguageTest(unittest.TestCase):
+
+    def test_compiled_alternatives(self):
+        for text, alternatives in COMPILED:
+            with self.subTest(text):
+                self.assertEqual(set(compile_pattern(text).alternatives), set(alternatives))
+
+    def test_any_n(self):
+        for text, count, masks in COUNTED:
+            with self.subTest(text):
+                pattern = compile_pattern(text)
+                self.assertIsInstance(pattern, CountPattern)
+                self.assertEqual((pattern.count, len(pattern.masks)), (count, masks))
+
+    def test_built_in_names_in_any_case(self):
+        for text, name in BUILT_IN:
+            with self.subTest(text):
+                self.assertIs(compile_pattern(text), PATTERNS[name])
+                self.assertIs(find_pattern(text), PATTERNS[name])
+
+    def test_invalid(self):
+        for text in INVALID:
+            with self.subTest(text):
+                with self.assertRaises(ValueError):
+                    compile_pattern(text)
+                self.assertIsNone(find_pattern(text))
+
+    def test_max_alternatives(self):
+        # 220 * 220 combinations
+        with self.assertRaisesRegex(ValueError, str(MAX_ALTERNATIVES)):
+            compile_pattern('any 3 lines + any 3 lines')
+        self.assertLessEqual(len(compile_pattern('any 3 lines + B1').alternatives), MAX_ALTERNATIVES)
+
+    def test_compiled_patterns_are_cached(self):
+        self.assertIs(compile_pattern('B1 B5 O1 O5'), compile_pattern('  b1,B5  o1 O5'))
+
+    def test_matching(self):
+        pattern = compile_pattern('row 1 | B1 B5 O1 O5')
+        self.assertTrue(pattern.matches(CORNERS | FREE_SPACE))
+        self.assertTrue(pattern.matches(ROWS[0]))
+        self.assertFalse(pattern.matches(ROWS[1] | COLUMNS[0]))
+        counted = compile_pattern('any 2 lines')
+        self.assertTrue(counted.matches(ROWS[0] | COLUMNS[4]))
+        self.assertFalse(counted.matches(ROWS[0] | COLUMNS[4] & ~ROWS[4]))
+
+
+if __name__ == '__main__':
+    unittest.main()
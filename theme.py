@@ -0,0 +1,88 @@
+from PyQt5.QtGui import QBrush, QColor, QPen
+
+from engine import LETTERS
+
+# Every colour the windows use, in one place. Ball labels are styled by one
+# stylesheet per window keyed on their `ball` and `letter` properties, so
+# showing a ball only changes a property and no stylesheet text is built or
+# parsed. The painted widgets take their brushes and pens from the current
+# theme when they paint.
+
+
+class Theme:
+    # Colours and everything derived from them, built once per theme
+
+    def __init__(self, name, letter_colors, letter_text_colors, idle='lightgray', idle_text='black',
+                 text='black', background=None, border='gray', highlight='orange', highlight_text='black',
+                 n_border='black', header_text_colors=None):
+        self.name = name
+        self.letter_colors = letter_colors
+        self.letter_text_colors = letter_text_colors
+        self.idle = idle
+        self.idle_text = idle_text
+        self.text = text
+        self.background = background  # None keeps the platform's window colour
+
+        self.letter_brushes = [QBrush(QColor(color)) for color in letter_colors]
+        self.letter_pens = [QPen(QColor(color)) for color in letter_text_colors]
+        # Letters over the board and template columns, black on every colour by default
+        self.header_pens = [QPen(QColor(color)) for color in header_text_colors or [text] * 5]
+        self.idle_brush = QBrush(QColor(idle))
+        self.text_pen = QPen(QColor(text))
+        self.border_pen = QPen(QColor(border), 2)
+        self.n_border_pen = QPen(QColor(n_border), 2)
+        self.highlight_brush = QBrush(QColor(highlight))
+        self.highlight_pen = QPen(QColor(highlight_text))
+        self.background_brush = None if background is None else QBrush(QColor(background))
+        # Windows without ball labels only get a stylesheet from themes that
+        # recolour whole windows, so they keep the cheaper plain style otherwise
+        self.window_stylesheet = self._window_stylesheet()
+        self.ball_stylesheet = self.window_stylesheet + self._ball_stylesheet()
+
+    def _window_stylesheet(self):
+        if self.background is None:
+            return ''
+        return (f"QWidget {{ background-color: {self.background}; color: {self.text}; }}\n"
+                f"QPushButton {{ border: 1px solid {self.text}; padding: 4px; }}\n"
+                f"QPushButton:checked {{ background-color: {self.text}; color: {self.background}; }}\n")
+
+    def _ball_stylesheet(self):
+        rules = [
+            f"QLabel[ball] {{ font-weight: bold; background-color: {self.idle}; color: {self.idle_text}; }}",
+            "QLabel[ball=\"current\"] { font-size: 64px; border-radius: 100px; }",
+            "QLabel[ball=\"stack\"] { font-size: 24px; border-radius: 25px; }",
+        ]
+        for letter, color, text in zip(LETTERS, self.letter_colors, self.letter_text_colors):
+            rules.append(f"QLabel[ball][letter=\"{letter}\"] {{ background-color: {color}; color: {text}; }}")
+        return '\n'.join(rules)
+
+
+THEMES = {theme.name: theme for theme in (
+    Theme('default', ['blue', 'red', 'white', 'green', 'yellow'], ['white', 'white', 'black', 'white', 'black']),
+    # For projectors: saturated balls on black, white text and borders
+    Theme('high-contrast', ['#0040ff', '#ff0000', '#ffffff', '#00c000', '#ffff00'],
+          ['#ffffff', '#ffffff', '#000000', '#000000', '#000000'],
+          idle='#404040', idle_text='#ffffff', text='#ffffff', background='#000000',
+          border='#ffffff', highlight='#ffff00', n_border='#ff00ff',
+          header_text_colors=['#ffffff', '#ffffff', '#000000', '#000000', '#000000']),
+)}
+
+current = THEMES['default']
+
+
+def use(name):
+    # Makes `name` the current theme; callers re-apply its stylesheets and
+    # repaint the painted widgets
+    global current
+    current = THEMES[name]
+    return current
+
+
+def restyle(widget, **properties):
+    # Sets dynamic properties and has the style re-match its rules; only
+    # call it when a value actually changes
+    for name, value in properties.items():
+        widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
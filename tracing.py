@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Upper bounds of the latency buckets, in microseconds
+BUCKETS_US = (50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000, 200000, 500000)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect_left(BUCKETS_US, seconds * 1e6)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self):
+        return {'count': self.count, 'mean_us': self.total / self.count * 1e6 if self.count else 0.0,
+                'max_us': self.max * 1e6,
+                'buckets_us': dict(zip([str(b) for b in BUCKETS_US] + ['inf'], self.counts))}
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record(time.perf_counter() - self.started)
+        return False
+
+
+class Tracer:
+    # Stage timings from a controller event to the windows that repaint for
+    # it. Every hook starts with a check of `enabled`, so leaving tracing off
+    # costs one attribute lookup per call.
+    #
+    # begin(event) opens a trace; span(name) times a stage; painted(name)
+    # records the latency from the open trace to a window finishing its
+    # first paint after it.
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self._event = None
+        self._started = 0.0
+        self._painted = set()
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def begin(self, event):
+        if self.enabled:
+            self._event = event
+            self._started = time.perf_counter()
+            self._painted = set()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self.histogram(name))
+
+    def painted(self, name):
+        if not self.enabled or self._event is None or name in self._painted:
+            return
+        self._painted.add(name)
+        self.histogram(f"{self._event} -> {name}").record(time.perf_counter() - self._started)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def prometheus(self):
+        lines = ['# TYPE bingo_latency_seconds histogram']
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+        for name, histogram in histograms:
+            label = name.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(BUCKETS_US, histogram.counts):
+                cumulative += count
+                lines.append(f'bingo_latency_seconds_bucket{{stage="{label}",le="{bound / 1e6:g}"}} {cumulative}')
+            lines.append(f'bingo_latency_seconds_bucket{{stage="{label}",le="+Inf"}} {histogram.count}')
+            lines.append(f'bingo_latency_seconds_sum{{stage="{label}"}} {histogram.total}')
+            lines.append(f'bingo_latency_seconds_count{{stage="{label}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port, host='127.0.0.1'):
+        # /metrics in Prometheus text format, /trace.json as JSON
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        tracer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = tracer.prometheus().encode(), 'text/plain; version=0.0.4'
+                elif self.path == '/trace.json':
+                    body, content_type = json.dumps(tracer.snapshot()).encode(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='bingo-metrics', daemon=True).start()
+        return server
+
+
+tracer = Tracer()
+
+
+def traced(name):
+    # Times every call of the decorated function as the stage `name`
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate